@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Usage: python -m benchmarks.bench_evaluator [shapes] [repeat]
+
+import sys
+import time
+
+from textmation.scenebuilder import SceneBuilder
+
+
+_header = """\
+width = 400
+height = 300
+"""
+
+_shapes = """
+create Circle
+	diameter = {0} + 10
+	center_x = 50% + {1}
+create Ellipse
+	diameter_x = 25%
+	diameter_y = {2} * 2
+"""
+
+# Number properties of Circle and Ellipse, which all
+# evaluate through the radius, diameter and center graph
+_names = "x", "y", "width", "height", "center_x", "center_y", "radius"
+
+
+def generate(shapes):
+	return _header + "".join(_shapes.format(i % 50, i % 7, i % 40 + 10) for i in range(shapes))
+
+
+def bench(f, repeat):
+	best = float("inf")
+	for _ in range(repeat):
+		begin = time.perf_counter()
+		f()
+		best = min(best, time.perf_counter() - begin)
+	return best
+
+
+def main(shapes=500, repeat=5):
+	scene = SceneBuilder().build(generate(shapes))
+
+	properties = [element.get_computed(name) for element in scene.elements for name in _names]
+
+	def invalidate():
+		for element in scene.elements:
+			for property in element.computed_properties.values():
+				property.invalidate()
+
+	def eval_boxed():
+		invalidate()
+		for property in properties:
+			property.eval().unbox()
+
+	def eval_unboxed():
+		invalidate()
+		for property in properties:
+			property.eval_unboxed()
+
+	def p_access():
+		invalidate()
+		for element in scene.elements:
+			element.p_x, element.p_y, element.p_width, element.p_height
+
+	print(f"{len(scene.elements)} shapes, {len(properties)} properties")
+
+	for name, f in (("eval().unbox()", eval_boxed), ("eval_unboxed()", eval_unboxed), ("p_ access", p_access)):
+		duration = bench(f, repeat)
+		print(f"{name}: {duration * 1000:.3f}ms")
+
+
+if __name__ == "__main__":
+	main(*map(int, sys.argv[1:]))
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Usage: python -m benchmarks.bench_keyframes [keyframes] [animations] [frames] [repeat]
+
+import sys
+import time
+import random
+
+from textmation.scenebuilder import SceneBuilder
+
+
+_header = """\
+width = 400
+height = 300
+"""
+
+_animation = """
+create Rectangle
+	create Animation
+{0}"""
+
+_keyframe = """\
+		create Keyframe
+			time = {0}ms
+			x = {1}
+"""
+
+
+def generate(keyframes, animations):
+	keyframes = "".join(_keyframe.format(i * 10, i % 100) for i in range(keyframes))
+	return _header + _animation.format(keyframes) * animations
+
+
+def bench(f, repeat):
+	best = float("inf")
+	for _ in range(repeat):
+		begin = time.perf_counter()
+		f()
+		best = min(best, time.perf_counter() - begin)
+	return best
+
+
+def main(keyframes=1000, animations=10, frames=2000, repeat=5):
+	scene = SceneBuilder().build(generate(keyframes, animations))
+
+	animations = [animation for element in scene.elements for animation in element.animations]
+	duration = animations[0].end_time
+
+	times = [duration * i / frames for i in range(frames)]
+	shuffled = random.Random(0).sample(times, len(times))
+
+	def get_between(times):
+		for animation in animations:
+			for time in times:
+				animation.get_between(time)
+
+	def compute():
+		for time in times:
+			scene.compute(time)
+
+	print(f"{len(animations)} animations, {keyframes} keyframes, {frames} frames")
+
+	for name, f in (("get_between() in order", lambda: get_between(times)), ("get_between() shuffled", lambda: get_between(shuffled)), ("compute()", compute)):
+		duration = bench(f, repeat)
+		print(f"{name}: {duration * 1000:.3f}ms")
+
+
+if __name__ == "__main__":
+	main(*map(int, sys.argv[1:]))
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Usage: python -m benchmarks.bench_parser [slides] [repeat]
+
+import sys
+import time
+
+from textmation.lexer import Lexer, FastLexer
+from textmation.parser import parse, reparse
+
+
+_header = """\
+width = 400
+height = 300
+
+template Slide inherit Rectangle
+	text := "Slide"
+
+	enter := 0s
+	exit := enter + 2s
+	transition_duration := 750ms
+
+	create Text
+		text = parent.text # Inherit text
+		font_size = 48
+
+	create Animation
+		fill_mode = "After"
+		create Keyframe
+			time = enter
+			x = -100%
+		create Keyframe
+			time = enter + transition_duration
+			x = 0
+"""
+
+_slide = """
+create Slide
+	text = "Slide {0}"
+	enter = {0}s
+	fill = rgba(255, {1}, 0, 100)
+"""
+
+
+def generate(slides):
+	return _header + "".join(_slide.format(i, i % 256) for i in range(slides))
+
+
+def count_tokens(string, lexer=Lexer):
+	return sum(1 for _ in lexer(string))
+
+
+def bench(f, repeat):
+	best = float("inf")
+	for _ in range(repeat):
+		begin = time.perf_counter()
+		f()
+		best = min(best, time.perf_counter() - begin)
+	return best
+
+
+def main(slides=2000, repeat=3):
+	string = generate(slides)
+	lines = string.count("\n")
+	tokens = count_tokens(string)
+
+	print(f"{lines} lines, {len(string) / 1024 / 1024:.1f} MB, {tokens} tokens")
+
+	for lexer in (Lexer, FastLexer):
+		duration = bench(lambda: count_tokens(string, lexer), repeat)
+		print(f"lex ({lexer.__name__}): {duration:.3f}s, {tokens / duration:,.0f} tokens/sec")
+
+	for lexer in (Lexer, FastLexer):
+		duration = bench(lambda: parse(string, lexer=lexer), repeat)
+		print(f"parse ({lexer.__name__}): {duration:.3f}s, {tokens / duration:,.0f} tokens/sec")
+
+	# Edit a single slide in the middle of the scene
+	scene = parse(string, lexer=FastLexer)
+	begin = string.index("Slide %d\"" % (slides // 2))
+	end = begin + len("Slide")
+
+	def edit():
+		reparse(scene, begin, end, "Edited")
+		reparse(scene, begin, begin + len("Edited"), "Slide")
+
+	duration = bench(edit, repeat) / 2
+	print(f"reparse (FastLexer): {duration * 1000:.3f}ms")
+
+
+if __name__ == "__main__":
+	main(*map(int, sys.argv[1:]))
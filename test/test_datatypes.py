@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from unittest import TestCase
+
+from math import pi
+
+from textmation.datatypes import Number, Vec2, Vec3, Vec4, Color, Point, pack_rgba
+from textmation.datatypes import Time, TimeUnit, Angle, AngleUnit
+
+
+class VectorTest(TestCase):
+	def assertValue(self, value, expected):
+		self.assertIs(type(value), type(expected))
+		self.assertEqual(repr(value), repr(expected))
+
+	def test_broadcast(self):
+		a = Vec4(1, 2, 3, 4)
+
+		self.assertValue(a + Vec4(1), Vec4(2, 3, 4, 5))
+		self.assertValue(a - Vec3(1, 2, 3), Vec4(0, 0, 0, 4))
+		self.assertValue(Vec2(1, 2) - a, Vec4(0, 0, -3, -4))
+		self.assertValue(a * Number(2), Vec4(2, 4, 6, 8))
+		self.assertValue(2 / a, Vec4(2.0, 1.0, 2 / 3, 0.5))
+		self.assertValue(-Color(1, 2, 3), Vec4(-1, -2, -3, -255))
+		self.assertValue(Point(1, 2) + Point(3, 4), Vec2(4, 6))
+		self.assertValue(Vec3(1, 2, 3) + Vec2(1, 1), Vec3(2, 3, 3))
+
+		with self.assertRaises(TypeError):
+			Vec2(1, 2) + "x"
+
+	def test_lerp(self):
+		for a, b in ((Number(5), Number(-3)), (Vec2(1, 2), Vec2(9, -4)), (Vec3(1, 2, 3), Vec3(5)), (Color(255, 0, 0), Color(0, 0, 255, 0))):
+			for t in (0, 0.3, 1):
+				self.assertValue(a.lerp(b, t), (1 - t) * a + t * b)
+
+		self.assertValue(Vec2(1, 2).lerp(Vec4(3), 0.5), Vec4(2.0, 2.5, 1.5, 1.5))
+
+	def test_rgba32(self):
+		self.assertEqual(pack_rgba(1, 2, 3, 4), 0x04030201)
+		self.assertEqual(pack_rgba(255.9, -1, 300, 127.5), 0x7FFF00FF)
+
+		color = Color(255, 128, 0)
+		self.assertEqual(color.rgba32, 0xFF0080FF)
+		self.assertIs(color.rgba32, color.rgba32)
+		self.assertEqual((color * 0.5).rgba32, 0x7F00407F)
+
+
+class UnitTest(TestCase):
+	def test_time(self):
+		a, b = Time(2, TimeUnit.Seconds), Time(750, TimeUnit.Milliseconds)
+
+		self.assertEqual((a.seconds, a.milliseconds), (2, 2000))
+		self.assertEqual((b.seconds, b.milliseconds), (0.75, 750))
+		self.assertEqual(repr(a + b), repr(Time(2750, TimeUnit.Milliseconds)))
+		self.assertEqual(str(b), "750ms")
+
+		self.assertLess(b, a)
+		self.assertFalse(Time(0.1, TimeUnit.Seconds) < Time(100, TimeUnit.Milliseconds))
+		self.assertFalse(Time(100, TimeUnit.Milliseconds) < Time(0.1, TimeUnit.Seconds))
+
+	def test_angle(self):
+		for angle in (Angle(180, AngleUnit.Degrees), Angle(pi, AngleUnit.Radians), Angle(0.5, AngleUnit.Turns)):
+			self.assertAlmostEqual(angle.degrees, 180)
+			self.assertAlmostEqual(angle.radians, pi)
+			self.assertAlmostEqual(angle.turns, 0.5)
@@ -0,0 +1,400 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from textwrap import dedent
+from unittest import TestCase
+
+from textmation.datatypes import Number, NumberType, String, StringType, Time, TimeUnit, Call, intern_number
+from textmation.functions import function, functions, FunctionError
+from textmation.scenebuilder import SceneBuilder, SceneBuilderError
+from textmation.elements import evaluation_counters, ElementProperty, PropertyAccessor, PrototypeProperty, Rectangle, AnimationDirection
+
+
+class FreezeTest(TestCase):
+	def setUp(self):
+		self.scene = SceneBuilder().build(dedent("""\
+			create Rectangle
+				width = 50
+				height = width * 2
+				create Animation
+					create Keyframe
+						time = 0s
+						x = 0
+					create Keyframe
+						time = 2s
+						x = 100
+			"""))
+		self.rect, = self.scene.elements
+
+	def test_static(self):
+		self.scene.compute(1)
+		self.assertEqual(list(self.rect._frozen), ["x"])
+		self.assertEqual((self.rect.p_x, self.rect.p_height), (50, 100))
+
+		# Animated properties are reset outside of the animation
+		self.scene.compute(3)
+		self.assertEqual(self.rect.p_x, 0)
+
+	def test_invalidate(self):
+		self.scene.compute(0)
+		self.rect.set("width", 20)
+		self.scene.compute(1)
+		self.assertEqual(self.rect.p_height, 40)
+
+	def test_refreeze(self):
+		program = self.scene.frame_program()
+
+		# Only changes of animated properties and animations refreeze the scene
+		self.rect.set("width", 20)
+		SceneBuilder().build("create Rectangle\n").elements[0].set("x", 10)
+		self.assertIs(self.scene.frame_program(), program)
+
+		self.rect.get("x").set(30)
+		self.assertIsNot(self.scene.frame_program(), program)
+		self.scene.compute(3)
+		self.assertEqual(self.rect.p_x, 30)
+
+		program = self.scene.frame_program()
+		animation, = self.rect.animations
+		animation.get("delay").set(Time(2, TimeUnit.Seconds))
+		self.assertIsNot(self.scene.frame_program(), program)
+		self.scene.compute(3)
+		self.assertEqual(self.rect.p_x, 50)
+
+
+class EvaluationTest(TestCase):
+	def test_invalidate(self):
+		scene = SceneBuilder().build(dedent("""\
+			a := 1
+			b := a * 2
+			c := b + 1
+			create Rectangle
+				width = 50%
+			"""))
+		rect, = scene.elements
+		c, width = scene.get("c"), rect.get("width")
+
+		self.assertEqual((c.eval().unbox(), width.eval().unbox()), (3, 50))
+
+		evaluation_counters.reset()
+		c.eval()
+		self.assertEqual((evaluation_counters.evaluated, evaluation_counters.skipped), (0, 1))
+
+		scene.set("a", 2)
+		scene.set("width", 10)
+		self.assertEqual((c.eval().unbox(), width.eval().unbox()), (5, 5))
+
+	def test_compile(self):
+		scene = SceneBuilder().build(dedent("""\
+			a := 4
+			b := rgba(a * 2, -a, a / 3, a - 3) * (a - 1)
+			create Rectangle
+				width = 25% + a
+			"""))
+		rect, = scene.elements
+
+		for property in (scene.get("b"), rect.get("width")):
+			self.assertEqual(repr(property.value.compile()()), repr(property.value.eval()))
+
+	def test_compile_checked(self):
+		@function("wrong_type", (Number,), String)
+		def wrong_type(x):
+			return x
+
+		del functions["wrong_type"]
+
+		property = ElementProperty("x", Number(1), (NumberType, StringType))
+		call = Call(wrong_type, (property,))
+		compiled = call.compile()
+
+		# Compiled calls raise the same errors as evaluated calls
+		for value, error in ((1, FunctionError), ("a", TypeError)):
+			property.set(value)
+			with self.assertRaises(error) as evaluated:
+				call.eval()
+			with self.assertRaises(error) as context:
+				compiled()
+			self.assertEqual(str(context.exception), str(evaluated.exception))
+
+	def test_unboxed(self):
+		scene = SceneBuilder().build(dedent("""\
+			a := 4
+			b := -(a * 3 - 1) / 2 - a
+			create Circle
+				diameter = 25% + a
+			"""))
+		circle, = scene.elements
+
+		for property in (scene.get("b"), circle.get("diameter"), circle.get("x"), circle.get_computed("center_y")):
+			value = property.eval_unboxed()
+			self.assertIsInstance(value, (int, float))
+			self.assertEqual(value, property.eval().unbox())
+			self.assertEqual(value, property.value.compile_unboxed()())
+
+	def test_unchanged(self):
+		scene = SceneBuilder().build(dedent("""\
+			create Rectangle
+				create Animation
+					fill_mode = "After"
+					create Keyframe
+						time = 0s
+						x = 0
+					create Keyframe
+						time = 1s
+						x = 100
+			"""))
+		rect, = scene.elements
+
+		scene.compute(2)
+		self.assertEqual(rect.p_x, 100)
+
+		evaluation_counters.reset()
+		scene.compute(3)
+		self.assertEqual(rect.p_x, 100)
+		self.assertEqual(evaluation_counters.evaluated, 0)
+		self.assertGreater(evaluation_counters.unchanged, 0)
+
+
+class InternTest(TestCase):
+	def test_interned(self):
+		scene = SceneBuilder().build(dedent("""\
+			create Circle
+				outline_width = 3 - 2
+			create Circle
+			"""))
+		a, b = scene.elements
+
+		for name in ("outline_width", "outline", "color"):
+			self.assertIs(a.get(name).eval(), b.get(name).eval())
+
+		self.assertFalse(hasattr(a.get("outline_width").eval(), "__dict__"))
+
+	def test_folded(self):
+		scene = SceneBuilder().build(dedent("""\
+			a := 2
+			b := 3 - 2
+			"""))
+
+		# Folded constants are interned like number literals
+		self.assertIs(scene.get("a").value, intern_number(2))
+		self.assertIs(scene.get("b").value, intern_number(1))
+
+
+class AccessorTest(TestCase):
+	def test_accessor(self):
+		scene = SceneBuilder().build(dedent("""\
+			create Rectangle
+				width = 25%
+				label := "a"
+			create Rectangle
+				x = 10
+			"""))
+		a, b = scene.elements
+
+		# Only the defaults of the class get an accessor
+		self.assertIsInstance(Rectangle.__dict__["p_width"], PropertyAccessor)
+		self.assertNotIn("p_label", Rectangle.__dict__)
+		self.assertEqual((a.p_x, a.p_width, a.p_label), (0, 25, "a"))
+		self.assertEqual((b.p_x, b.p_width), (10, 100))
+
+		scene.set("width", 200)
+		self.assertEqual(a.p_width, 50)
+
+		with self.assertRaises(KeyError):
+			b.p_label
+
+
+class PrototypeTest(TestCase):
+	def test_prototype(self):
+		scene = SceneBuilder().build(dedent("""\
+			template Label inherit Rectangle
+				label := "a"
+			create Label
+			create Label
+				outline_width = 2
+			create Label
+			"""))
+		a, b, c = scene.elements
+
+		# Constant defaults are shared until assigned or referenced
+		self.assertIsInstance(a.properties["outline_width"], PrototypeProperty)
+		self.assertIs(a.properties["outline_width"], c.properties["outline_width"])
+		self.assertIsNot(a.properties["outline_width"], b.properties["outline_width"])
+		self.assertEqual((a.p_outline_width, b.p_outline_width), (1, 2))
+
+		a.set("outline_width", 3)
+		self.assertEqual((a.p_outline_width, c.p_outline_width), (3, 1))
+		self.assertIs(a.get("outline_width"), a.properties["outline_width"])
+		self.assertIsInstance(c.properties["outline_width"], PrototypeProperty)
+
+		# Properties declared by templates are never shared
+		self.assertIsNot(a.properties["label"], c.properties["label"])
+		self.assertNotIsInstance(a.properties["label"], PrototypeProperty)
+
+
+class FrameProgramTest(TestCase):
+	def test_precedence(self):
+		scene = SceneBuilder().build(dedent("""\
+			create Rectangle
+				create Animation
+					fill_mode = "Always"
+					create Keyframe
+						x = 10
+					create Keyframe
+						time = 1s
+						x = 10
+				create Animation
+					create Keyframe
+						time = 1s
+						x = 20
+					create Keyframe
+						time = 2s
+						x = 20
+			"""))
+		rect, = scene.elements
+
+		xs = []
+		for time in (0, 1.5, 3):
+			scene.compute(time)
+			xs.append(rect.p_x)
+
+		# The later animation only takes precedence while it's affecting
+		self.assertEqual(xs, [10, 20, 10])
+
+	def test_index(self):
+		scene = SceneBuilder().build(dedent("""\
+			create Rectangle
+				create Animation
+					delay = 1s
+					create Keyframe
+						x = 10
+					create Keyframe
+						time = 1s
+						x = 20
+			create Rectangle
+				create Animation
+					fill_mode = "Before"
+					create Keyframe
+						time = 2s
+						y = 10
+					create Keyframe
+						time = 3s
+						y = 20
+			create Rectangle
+				x = 5
+			"""))
+		a, b, c = scene.elements
+
+		results = []
+		for time in (0, 1, 2.5, 3.5, 1.5, 0):
+			scene.compute(time)
+			results.append((sorted(scene._index.find(time)), a.p_x, b.p_y))
+
+		# Elements are only sampled while an animation is affecting them,
+		# and reset once it stops, also if the time goes backwards
+		self.assertEqual(results, [
+			([1], 0, 10),
+			([0, 1], 10, 10),
+			([1], 0, 10),
+			([], 0, 0),
+			([0, 1], 15, 10),
+			([1], 0, 10),
+		])
+		self.assertEqual(c.p_x, 5)
+
+	def test_aliased(self):
+		scene = SceneBuilder().build(dedent("""\
+			create Rectangle
+				create Animation
+					create Keyframe
+						time = 0s
+						color = rgba(10, 20, 30, 255)
+					create Keyframe
+						time = 1s
+						color = rgba(10, 20, 30, 255)
+			"""))
+		rect, = scene.elements
+		color = rect.get("color").eval()
+
+		scene.compute(0.5)
+
+		# Only animated properties get a computed property of their own
+		self.assertIs(rect.get_computed("width"), rect.get("width"))
+		self.assertIsNot(rect.get_computed("color"), rect.get("color"))
+		self.assertIs(rect.get("color").eval(), color)
+		self.assertEqual(tuple(rect.p_color), (10, 20, 30, 255))
+
+
+class KeyframeTest(TestCase):
+	def test_between(self):
+		keyframes = "".join(f"\t\tcreate Keyframe\n\t\t\ttime = {time}s\n\t\t\tx = {i}\n" for i, time in enumerate((0, 1, 1, 2, 4, 5)))
+		scene = SceneBuilder().build(f"create Rectangle\n\tcreate Animation\n{keyframes}")
+		animation, = scene.elements[0].animations
+		keyframes = animation.keyframes
+
+		def get_between(time):
+			if time < 0:
+				return keyframes[0], keyframes[0]
+			if time >= 5:
+				return keyframes[-1], keyframes[-1]
+			for before, after in zip(keyframes, keyframes[1:]):
+				if time < after.time.seconds:
+					return before, after
+
+		# In order, in reverse and skipping keyframes
+		times = [-1, 0, 0.5, 1, 1.5, 2, 3, 4, 4.5, 5, 6]
+		for time in times + times[::-1] + times[::3]:
+			with self.subTest(time=time):
+				self.assertEqual(animation.get_between(time), get_between(time))
+
+
+class ScheduleTest(TestCase):
+	def test_schedule(self):
+		scene = SceneBuilder().build(dedent("""\
+			start := 500ms
+			create Rectangle
+				create Animation
+					delay = start
+					iterations = 2
+					direction = "Alternate"
+					create Keyframe
+						time = 1s
+						x = 0
+					create Keyframe
+						time = 3s
+						x = 100
+			"""))
+		animation, = scene.elements[0].animations
+		schedule = animation.schedule
+
+		self.assertEqual(schedule.keyframe_times, (1, 3))
+		self.assertEqual((schedule.begin_time, schedule.end_time, schedule.iteration_duration), (1.5, 5.5, 2))
+		self.assertIs(schedule.direction, AnimationDirection.Alternate)
+		self.assertIs(animation.schedule, schedule)
+
+		# The schedule follows changes of its inputs
+		scene.set("start", Time(1, TimeUnit.Seconds))
+		self.assertEqual((animation.begin_time, animation.end_time), (2, 6))
+		self.assertIsNot(animation.schedule, schedule)
+
+		# Also when assigned to the property directly
+		schedule = animation.schedule
+		animation.keyframes[0].get("time").set(Time(0, TimeUnit.Seconds))
+		self.assertEqual((animation.begin_time, animation.end_time), (1, 7))
+		self.assertIsNot(animation.schedule, schedule)
+
+		# But not changes of other properties
+		schedule = animation.schedule
+		scene.set("width", 200)
+		scene.elements[0].set("x", 10)
+		self.assertIs(animation.schedule, schedule)
+
+	def test_invalid(self):
+		with self.assertRaises(SceneBuilderError):
+			SceneBuilder().build(dedent("""\
+				create Rectangle
+					create Animation
+						fill_mode = "Sometimes"
+						create Keyframe
+							x = 0
+				"""))
@@ -1,11 +1,17 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import os
+from glob import glob
 from itertools import zip_longest
+from random import Random
 from textwrap import dedent
 from unittest import TestCase
 
-from textmation.lexer import Lexer, Token, TokenType, LexerError
+from textmation.lexer import Lexer, FastLexer, Token, TokenType, LexerError
+
+
+_examples = os.path.join(os.path.dirname(__file__), os.pardir, "examples")
 
 
 class LexerTest(TestCase):
@@ -581,3 +587,95 @@ class LexerTest(TestCase):
 			test()
 		with self.subTest(iteration=3):
 			test()
+
+
+class FastLexerTest(TestCase):
+	"""FastLexer must produce the same token stream as Lexer."""
+
+	_strings = (
+		"",
+		"\n\n",
+		"a",
+		"a\n\tb\n\t\tc\n\td\ne",
+		"a\n  b\n    c\n  d\n",
+		"a (b\n\tc) [d, e] {f}",
+		"x = 12 + 3.5 * 50% - 10ms / 2s",
+		"12px 3.5deg 0.25turn 1.",
+		"'Hello World' \"Hello \\\" World\" 'Hello \\' World'",
+		"a # Comment\n\t# Comment\nb",
+		"a:=b+-c//d%e",
+		"a\n\n\t\n\tb",
+	)
+
+	_invalid = (
+		"\"Hello",
+		"'Hello\nWorld'",
+		"a)",
+		"(a]",
+		"(a",
+		"a\n\t\tb\n\tc",
+	)
+
+	def _tokenize(self, lexer_type, string):
+		return [(token.type, token.value, token.span) for token in lexer_type(string)]
+
+	def assertSameTokens(self, string):
+		self.assertEqual(self._tokenize(FastLexer, string), self._tokenize(Lexer, string))
+
+	def test_strings(self):
+		for string in self._strings:
+			with self.subTest(string=string):
+				self.assertSameTokens(string)
+
+	def test_examples(self):
+		for filename in sorted(glob(os.path.join(_examples, "*.anim"))):
+			with self.subTest(filename=os.path.basename(filename)), open(filename) as f:
+				self.assertSameTokens(f.read())
+
+	def test_generated(self):
+		random = Random(0)
+		parts = ["a", "b1", "_c", "12", "3.5", "50%", "2s", "'s'", "\"t\"", "+", "-", "*", "/", ":=", "=", ".", ",", "(", ")", "# c"]
+
+		for i in range(200):
+			lines = []
+			for _ in range(random.randint(1, 8)):
+				depth = random.randint(0, 2)
+				line = " ".join(random.choice(parts) for _ in range(random.randint(1, 6)))
+				lines.append("\t" * depth + line)
+			string = "\n".join(lines)
+
+			with self.subTest(string=string):
+				try:
+					expected = self._tokenize(Lexer, string)
+				except LexerError as ex:
+					with self.assertRaises(LexerError) as cm:
+						self._tokenize(FastLexer, string)
+					self.assertEqual(str(cm.exception), str(ex))
+				else:
+					self.assertEqual(self._tokenize(FastLexer, string), expected)
+
+	def test_invalid(self):
+		for string in self._invalid:
+			with self.subTest(string=string):
+				with self.assertRaises(LexerError) as expected:
+					self._tokenize(Lexer, string)
+				with self.assertRaises(LexerError) as actual:
+					self._tokenize(FastLexer, string)
+				self.assertEqual(str(actual.exception), str(expected.exception))
+
+	def test_peeking(self):
+		string = "a (b, c)\n\td = 1\ne"
+
+		def tokenize(lexer_type):
+			lexer = lexer_type(string)
+			tokens = []
+			with lexer.peeking():
+				tokens.append(lexer.peek(2))
+				tokens.append(lexer.next())
+			state = lexer.get_state()
+			tokens.extend(lexer.next() for _ in range(4))
+			lexer.set_state(state)
+			tokens.extend(lexer)
+			return [(token.type, token.value, token.span) for token in tokens]
+
+		self.assertEqual(tokenize(FastLexer), tokenize(Lexer))
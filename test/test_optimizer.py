@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from unittest import TestCase
+
+from textmation.parser import parse, BinOp, Number
+from textmation.optimizer import Constant, fold_constants
+from textmation.datatypes import Number as NumberValue, Time, TimeUnit, Vec3, Vec4
+
+
+def _fold_value(string):
+	scene = fold_constants(parse(f"x = {string}\n"))
+	assign, = scene.children
+	return assign.value
+
+
+class ConstantFolderTest(TestCase):
+	def assertConstant(self, string, expected):
+		value = _fold_value(string)
+		self.assertIsInstance(value, Constant)
+		self.assertIs(type(value.value), type(expected))
+		self.assertEqual(repr(value.value), repr(expected))
+
+	def test_fold(self):
+		self.assertConstant("1 + 2 * 3", NumberValue(7))
+		self.assertConstant("-(1 - 3)", NumberValue(2))
+		self.assertConstant("2s + 750ms", Time(2750, TimeUnit.Milliseconds))
+		self.assertConstant("rgba(255, 0, 0, 100)", Vec4(255, 0, 0, 100))
+		self.assertConstant("rgb(1 + 1, 0, 0) * 2", Vec3(4, 0, 0))
+
+	def test_not_folded(self):
+		value = _fold_value("enter + 2s")
+		self.assertIsInstance(value, BinOp)
+		self.assertIsInstance(value.rhs, Constant)
+
+		value = _fold_value("-100%")
+		self.assertIsInstance(value, Number)
+		self.assertEqual((value.value, value.unit), (-100, "%"))
+
+		# Errors are left for the scene builder to report
+		self.assertIsInstance(_fold_value("1 / 0"), BinOp)
+		self.assertIsInstance(_fold_value("1s + 1"), BinOp)
+
+	def test_unchanged(self):
+		tree = parse("x = 1 + 2\n")
+		folded = fold_constants(tree)
+		self.assertIsNot(folded, tree)
+		self.assertIsInstance(tree.children[0].value, BinOp)
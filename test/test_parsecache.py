@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+from tempfile import TemporaryDirectory
+from textwrap import dedent
+from unittest import TestCase
+
+from textmation.parser import parse, reparse
+from textmation.parsecache import ParseCache, dumps, loads
+
+
+def _dump(node):
+	span = node.token.span if node.token is not None else None
+	return repr(node), span, [_dump(child) for child in node.children]
+
+
+class ParseCacheTest(TestCase):
+	string = dedent("""\
+		width = 400
+
+		template Slide inherit Rectangle
+			text := "Slide"
+
+		create Slide
+			text = "First"
+
+		# Comment
+		create Slide as second
+			text = "Second"
+			create Text
+				text = parent.text
+		""")
+
+	def test_dumps_loads(self):
+		scene = parse(self.string)
+		loaded = loads(dumps(scene), self.string)
+		self.assertEqual(_dump(loaded), _dump(scene))
+		self.assertEqual(loaded.offsets, scene.offsets)
+
+	def test_reparsed(self):
+		scene = parse(self.string)
+		begin = self.string.index("\"First\"")
+		reparse(scene, begin, begin, "\"1st\"\n\ty = 1\n\tx = ")
+
+		# Reused tokens are stored with their positions in the new string
+		loaded = loads(dumps(scene), scene.string)
+		self.assertEqual(_dump(loaded), _dump(scene))
+		self.assertEqual(_dump(loaded), _dump(parse(scene.string)))
+
+	def test_hit(self):
+		with TemporaryDirectory() as directory:
+			cache = ParseCache(directory)
+			scene = cache.parse(self.string)
+			self.assertEqual(len(os.listdir(directory)), 1)
+
+			cached = cache.parse(self.string)
+			self.assertIsNot(cached, scene)
+			self.assertEqual(_dump(cached), _dump(scene))
+
+	def test_iter_parse(self):
+		scene = parse(self.string)
+
+		with TemporaryDirectory() as directory:
+			cache = ParseCache(directory)
+
+			# A miss is streamed, and only stored once it is complete
+			nodes = cache.iter_parse(self.string)
+			self.assertEqual(_dump(next(nodes)), _dump(scene.children[0]))
+			self.assertEqual(os.listdir(directory), [])
+			rest = list(nodes)
+			self.assertEqual(len(os.listdir(directory)), 1)
+
+			cached = cache.parse(self.string)
+			self.assertEqual(_dump(cached), _dump(scene))
+			self.assertEqual(cached.offsets, scene.offsets)
+
+			nodes = list(cache.iter_parse(self.string))
+			self.assertEqual(list(map(_dump, nodes)), list(map(_dump, scene.children)))
+			self.assertEqual(len(rest), len(nodes) - 1)
+
+	def test_corrupted(self):
+		with TemporaryDirectory() as directory:
+			cache = ParseCache(directory)
+			scene = cache.parse(self.string)
+
+			path, = (os.path.join(directory, name) for name in os.listdir(directory))
+			with open(path, "wb") as f:
+				f.write(b"\0")
+
+			self.assertEqual(_dump(cache.parse(self.string)), _dump(scene))
+
+	def test_evict(self):
+		with TemporaryDirectory() as directory:
+			cache = ParseCache(directory, max_entries=2)
+			for i in range(5):
+				cache.parse(f"x = {i}\n")
+				self.assertEqual(len(os.listdir(directory)), min(i + 1, 2))
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from textwrap import dedent
+from unittest import TestCase
+
+from textmation.lexer import Lexer, FastLexer, LexerError
+from textmation.parser import parse, iter_parse, reparse, ParserError
+
+
+def _dump(node):
+	span = node.token.span if node.token is not None else None
+	return repr(node), span, [_dump(child) for child in node.children]
+
+
+class ReparseTest(TestCase):
+	string = dedent("""\
+		width = 400
+
+		template Slide inherit Rectangle
+			text := "Slide"
+
+		create Slide
+			text = "First"
+
+		# Comment
+		create Slide as second
+			text = "Second"
+			create Text
+				text = parent.text
+		""")
+
+	edits = [
+		("\"First\"", "\"1st\""),
+		("\"Second\"", "\"2nd\"\n\tx = max(1,\n\t\t2)"),
+		("create Slide as second", "create Text"),
+		("# Comment\n", ""),
+		("\ncreate Slide\n", "\n  \n"),
+		("create Slide\n", "create Slide\n\ty = 1\ncreate Text\n"),
+		("width = 400", "width = 400\nheight = 300"),
+		("\t\ttext = parent.text\n", ""),
+	]
+
+	def assertReparse(self, lexer, old, new):
+		begin = self.string.index(old)
+		end = begin + len(old)
+		string = self.string[:begin] + new + self.string[end:]
+
+		scene = parse(self.string, lexer=lexer)
+		self.assertIs(reparse(scene, begin, end, new, lexer=lexer), scene)
+
+		expected = parse(string, lexer=lexer)
+		self.assertEqual(_dump(scene), _dump(expected))
+		self.assertEqual(scene.offsets, expected.offsets)
+		self.assertEqual(scene.string, string)
+
+	def test_reparse(self):
+		for lexer in (Lexer, FastLexer):
+			for old, new in self.edits:
+				with self.subTest(lexer=lexer.__name__, old=old, new=new):
+					self.assertReparse(lexer, old, new)
+
+	def test_reuse(self):
+		scene = parse(self.string)
+		children = list(scene.children)
+
+		begin = self.string.index("\"First\"")
+		reparse(scene, begin, begin + len("\"First\""), "\"1st\"")
+
+		self.assertIs(scene.children[0], children[0])
+		self.assertIs(scene.children[1], children[1])
+		self.assertIsNot(scene.children[2], children[2])
+		self.assertIs(scene.children[3], children[3])
+
+	def test_many_edits(self):
+		scene = parse(self.string)
+		string = self.string
+		begin = string.index("\"First\"") + 1
+
+		for i in range(100):
+			reparse(scene, begin, begin + 1, "fF"[i % 2])
+			string = string[:begin] + "fF"[i % 2] + string[begin + 1:]
+
+			tables = set()
+			stack = list(scene.children)
+			while stack:
+				node = stack.pop()
+				tables.add(node.token.lines)
+				stack.extend(node.children)
+
+			# Superseded tables don't keep their string alive, and
+			# resolve positions directly with the latest table
+			for lines in tables - {scene.lines}:
+				self.assertIsNone(lines.string)
+				self.assertIs(lines._edits.lines, scene.lines)
+
+		self.assertEqual(_dump(scene), _dump(parse(string)))
+
+	def test_invalid(self):
+		scene = parse(self.string)
+		begin = self.string.index("\"Second\"")
+		with self.assertRaises(ParserError):
+			reparse(scene, begin, begin, "create ")
+
+
+class IterParseTest(TestCase):
+	def test_iter_parse(self):
+		string = ReparseTest.string
+		for lexer in (Lexer, FastLexer):
+			with self.subTest(lexer=lexer.__name__):
+				nodes = list(iter_parse(string, lexer=lexer))
+				self.assertEqual(list(map(_dump, nodes)), list(map(_dump, parse(string, lexer=lexer).children)))
+
+	def test_lazy(self):
+		nodes = iter_parse(dedent("""\
+			create Rectangle
+				width = 100
+			create Rectangle
+				width = 100)
+			"""))
+
+		self.assertEqual(repr(next(nodes)), "<Create: Rectangle>")
+		with self.assertRaises(LexerError):
+			next(nodes)
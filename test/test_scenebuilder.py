@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from textwrap import dedent
+from unittest import TestCase
+
+from textmation.scenebuilder import SceneBuilder, SceneBuilderError
+
+
+class TemplateTest(TestCase):
+	def test_instances(self):
+		scene = SceneBuilder().build(dedent("""\
+			ix := 5
+			template T inherit Rectangle
+				create Rectangle
+					width = ix * 10
+			create HBox
+				create T
+				create T
+			create T
+			"""))
+
+		hbox, t = scene.elements
+		widths = [instance.elements[0].eval("width").unbox() for instance in (*hbox.elements, t)]
+
+		# ix is defined by HBox for its children, otherwise it's the scene's
+		self.assertEqual(widths, [0, 10, 50])
+
+	def test_undefined(self):
+		builder = SceneBuilder()
+		string = dedent("""\
+			template T inherit Rectangle
+				width = undefined
+			create T
+			""")
+
+		with self.assertRaisesRegex(SceneBuilderError, r"Undefined property 'undefined' at 2:10 to 2:19"):
+			builder.build(string)
+
+
+class CircularReferenceTest(TestCase):
+	def test_paths(self):
+		string = dedent("""\
+			a := 1
+			b := a
+			c := b + a
+			a = c
+			""")
+
+		with self.assertRaisesRegex(SceneBuilderError, r"(?s)Circular dependency.*Paths:\na -> c -> b -> a\na -> c -> a"):
+			SceneBuilder().build(string)
+
+	def test_reference(self):
+		with self.assertRaisesRegex(SceneBuilderError, r"(?s)Circular dependency.*Paths:\na -> c -> b -> a"):
+			SceneBuilder().build("a := 1\nb := a\nc := b\na = c\n")
+
+	def test_self_reference(self):
+		with self.assertRaisesRegex(SceneBuilderError, r"(?s)Circular dependency.*Paths:\nwidth -> width"):
+			SceneBuilder().build("create Rectangle\n\twidth = width + 1\n")
+
+	def test_shared(self):
+		# Diamond shaped dependencies are not cycles
+		scene = SceneBuilder().build(dedent("""\
+			a := 1
+			b := a + a
+			c := a * b
+			d := b + c
+			"""))
+		self.assertEqual(scene.eval("d").unbox(), 4)
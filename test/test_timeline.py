@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from textwrap import dedent
+from unittest import TestCase, skipIf
+
+from textmation.scenebuilder import SceneBuilder
+from textmation.timeline import Timeline, np
+
+
+_string = dedent("""\
+	template Box inherit Rectangle
+		direction := "Normal"
+		fill_mode := "Never"
+
+		create Animation
+			direction = parent.direction
+			fill_mode = parent.fill_mode
+			delay = 250ms
+			iterations = 2
+			create Keyframe
+				time = 0s
+				x = 0
+				fill = rgba(255, 0, 0, 255)
+			create Keyframe
+				time = 1s
+				x = 50%
+			create Keyframe
+				time = 1500ms
+				x = 100
+				fill = rgba(0, 0, 255, 0)
+
+	create VBox
+		create Box
+			direction = "Reverse"
+			fill_mode = "After"
+		create Box
+			direction = "Alternate"
+			fill_mode = "Before"
+		create Box
+			direction = "AlternateReverse"
+			fill_mode = "Always"
+		create Box
+	""")
+
+
+class TimelineTest(TestCase):
+	def assertTimeline(self, vectorize):
+		scene = SceneBuilder().build(_string)
+		times = [frame / 10 for frame in range(45)]
+
+		timeline = Timeline(scene, times, vectorize=vectorize)
+		self.assertEqual(timeline.vectorize, vectorize)
+
+		elements = scene.elements[0].elements
+
+		for frame, time in enumerate(times):
+			scene.compute(time)
+			expected = [(element.p_x, element.p_fill.xyzw) for element in elements]
+
+			timeline.apply(frame)
+			values = [(element.p_x, element.p_fill.xyzw) for element in elements]
+
+			for value, expected_value in zip(values, expected):
+				self.assertAlmostEqual(value[0], expected_value[0])
+				self.assertIs(type(value[0]), type(expected_value[0]))
+				for component, expected_component in zip(value[1], expected_value[1]):
+					self.assertAlmostEqual(component, expected_component)
+					self.assertIs(type(component), type(expected_component))
+
+	def test_sampled(self):
+		self.assertTimeline(False)
+
+	@skipIf(np is None, "NumPy is not installed")
+	def test_vectorized(self):
+		self.assertTimeline(True)
@@ -9,7 +9,8 @@ import time
 import subprocess
 from argparse import ArgumentParser
 
-from .parser import parse
+from .parser import parse, iter_parse
+from .parsecache import ParseCache
 from .scenebuilder import SceneBuilder
 from .rasterizer import Image
 from .renderer import render_animation, calc_frame_count
@@ -20,7 +21,7 @@ _ffmpeg_formats = ".mp4", ".avi", ".webm"
 _formats = ".gif", *_ffmpeg_formats
 
 
-def run(input_filename, output_filename, *, save_frames=False, print_ast=False, print_scene=False):
+def run(input_filename, output_filename, *, save_frames=False, print_ast=False, print_scene=False, parse_cache=True, vectorize=False):
 	begin = time.time()
 
 	output_dir = abspath(dirname(output_filename))
@@ -40,17 +41,31 @@ def run(input_filename, output_filename, *, save_frames=False, print_ast=False,
 	with open(input_filename) as f:
 		string = f.read()
 
-	print("Parsing...", flush=True)
-
-	tree = parse(string)
+	builder = SceneBuilder()
 
 	if print_ast:
+		print("Parsing...", flush=True)
+
+		if parse_cache:
+			tree = ParseCache().parse(string)
+		else:
+			tree = parse(string)
+
 		pprint_ast(tree)
 
-	print("Building Scene...", flush=True)
+		print("Building Scene...", flush=True)
 
-	builder = SceneBuilder()
-	scene = builder.build(tree)
+		scene = builder.build(tree)
+	else:
+		print("Parsing and Building Scene...", flush=True)
+
+		# Building overlaps with parsing, unless the tree is cached
+		if parse_cache:
+			nodes = ParseCache().iter_parse(string)
+		else:
+			nodes = iter_parse(string)
+
+		scene = builder.build_stream(nodes)
 
 	if print_scene:
 		pprint_element(scene)
@@ -58,7 +73,7 @@ def run(input_filename, output_filename, *, save_frames=False, print_ast=False,
 	print(f"Rendering {calc_frame_count(scene.p_duration.seconds, scene.p_frame_rate, inclusive=scene.p_inclusive)} frames...", flush=True)
 
 	inclusive = bool(scene.p_inclusive)
-	frames = render_animation(scene, inclusive=inclusive)
+	frames = render_animation(scene, inclusive=inclusive, vectorize=vectorize)
 
 	if save_frames:
 		print("Exporting Frames...", flush=True)
@@ -96,10 +111,12 @@ def main():
 	args_parser.add_argument("--save-frames", action="store_const", const=True, default=False)
 	args_parser.add_argument("--print-ast", action="store_const", const=True, default=False)
 	args_parser.add_argument("--print-scene", action="store_const", const=True, default=False)
+	args_parser.add_argument("--no-parse-cache", dest="parse_cache", action="store_const", const=False, default=True, help="Disable the on-disk parse cache")
+	args_parser.add_argument("--vectorize", action="store_const", const=True, default=False, help="Evaluate animations for all frames at once, using NumPy if installed")
 
 	args = args_parser.parse_args()
 
-	run(args.filename, args.output, save_frames=args.save_frames, print_ast=args.print_ast, print_scene=args.print_scene)
+	run(args.filename, args.output, save_frames=args.save_frames, print_ast=args.print_ast, print_scene=args.print_scene, parse_cache=args.parse_cache, vectorize=args.vectorize)
 
 
 if __name__ == "__main__":
@@ -3,6 +3,7 @@
 
 from enum import Enum
 from functools import total_ordering
+import operator
 import math
 
 
@@ -55,6 +56,8 @@ class Type:
 
 
 class Value:
+	__slots__ = ()
+
 	@property
 	def type(self):
 		raise NotImplementedError
@@ -65,9 +68,23 @@ class Value:
 	def eval(self):
 		return self
 
+	def compile(self):
+		"""Returns a function taking no arguments, which evaluates the value."""
+		return self.eval
+
+	def compile_unboxed(self):
+		"""Like compile(), but the function returns the unboxed value."""
+		evaluate = self.compile()
+		return lambda: evaluate().unbox()
+
 	def apply(self, relative):
 		pass
 
+	def lerp(self, other, t):
+		"""Linearly interpolates from the value to other by t."""
+		# return self + t * (other - self) # Imprecise
+		return (1 - t) * self + t * other # Precise
+
 	def iter_values(self):
 		return
 		yield
@@ -99,6 +116,8 @@ NumberType = _Number()
 
 
 class Number(Value):
+	__slots__ = "value",
+
 	type = NumberType
 
 	def __init__(self, value):
@@ -108,6 +127,15 @@ class Number(Value):
 	def unbox(self):
 		return self.value
 
+	def compile_unboxed(self):
+		value = self.value
+		return lambda: value
+
+	def lerp(self, other, t):
+		if isinstance(other, Number):
+			return Number((1 - t) * self.value + t * other.value)
+		return super().lerp(other, t)
+
 	def __add__(self, other):
 		if isinstance(other, Number):
 			return Number(self.value + other.value)
@@ -192,6 +220,19 @@ class Number(Value):
 		return f"{self.__class__.__name__}({self.value})"
 
 
+# Numbers are never modified once created, so common ones are shared
+_interned_numbers = dict((value, Number(value)) for value in range(-1, 256))
+
+
+def intern_number(value):
+	"""Returns a Number of value, sharing the instance for small integers."""
+	if type(value) is int:
+		number = _interned_numbers.get(value)
+		if number is not None:
+			return number
+	return Number(value)
+
+
 class _String(Type):
 	def __add__(self, other):
 		return StringType
@@ -203,6 +244,8 @@ StringType = _String()
 
 
 class String(Value):
+	__slots__ = "string",
+
 	type = StringType
 
 	def __init__(self, string):
@@ -262,6 +305,8 @@ class AngleUnit(Enum):
 
 
 class Angle(Value):
+	__slots__ = "angle", "unit", "radians", "degrees"
+
 	type = AngleType
 
 	def __init__(self, angle, unit):
@@ -270,25 +315,16 @@ class Angle(Value):
 		self.angle = angle
 		self.unit = unit
 
-	@property
-	def degrees(self):
-		if self.unit == AngleUnit.Degrees:
-			return self.angle
-		if self.unit == AngleUnit.Radians:
-			return math.degrees(self.angle)
-		if self.unit == AngleUnit.Turns:
-			return self.angle * 360
-		raise NotImplementedError
-
-	@property
-	def radians(self):
-		if self.unit == AngleUnit.Radians:
-			return self.angle
-		if self.unit == AngleUnit.Degrees:
-			return math.radians(self.angle)
-		if self.unit == AngleUnit.Turns:
-			return self.angle * math.tau
-		raise NotImplementedError
+		# The unit is only kept for display, the angle is
+		# converted once such that reading it is free
+		if unit is AngleUnit.Degrees:
+			self.radians, self.degrees = math.radians(angle), angle
+		elif unit is AngleUnit.Radians:
+			self.radians, self.degrees = angle, math.degrees(angle)
+		elif unit is AngleUnit.Turns:
+			self.radians, self.degrees = angle * math.tau, angle * 360
+		else:
+			raise NotImplementedError
 
 	@property
 	def turns(self):
@@ -373,6 +409,8 @@ class TimeUnit(Enum):
 
 @total_ordering
 class Time(Value):
+	__slots__ = "duration", "unit", "seconds", "milliseconds"
+
 	type = TimeType
 
 	def __init__(self, duration, unit):
@@ -381,17 +419,14 @@ class Time(Value):
 		self.duration = duration
 		self.unit = unit
 
-	@property
-	def seconds(self):
-		if self.unit == TimeUnit.Seconds:
-			return self.duration
-		return self.milliseconds / 1000
-
-	@property
-	def milliseconds(self):
-		if self.unit == TimeUnit.Milliseconds:
-			return self.duration
-		return self.seconds * 1000
+		# The unit is only kept for display, the duration is
+		# converted once such that reading it is free
+		if unit is TimeUnit.Seconds:
+			self.seconds, self.milliseconds = duration, duration * 1000
+		elif unit is TimeUnit.Milliseconds:
+			self.seconds, self.milliseconds = duration / 1000, duration
+		else:
+			raise NotImplementedError
 
 	def __add__(self, other):
 		if isinstance(other, Time):
@@ -420,7 +455,7 @@ class Time(Value):
 
 	def __lt__(self, other):
 		if isinstance(other, Time):
-			return self.milliseconds < other.milliseconds
+			return self.seconds < other.seconds
 		return NotImplemented
 
 	def __str__(self):
@@ -491,7 +526,54 @@ Vec3Type = _Vec3()
 Vec4Type = _Vec4()
 
 
+def _as_vec2(value):
+	"""Returns the components of value broadcast to a Vec2 operand,
+	or None if value can't be used as one."""
+	if isinstance(value, Vec2):
+		return value.x, value.y
+	if isinstance(value, Number):
+		value = value.value
+		return value, value
+	if isinstance(value, (int, float)):
+		return value, value
+	return None
+
+
+def _as_vec3(value):
+	"""Returns the components of value broadcast to a Vec3 operand,
+	or None if value can't be used as one."""
+	if isinstance(value, Vec3):
+		return value.x, value.y, value.z
+	if isinstance(value, Vec2):
+		return value.x, value.y, 0
+	if isinstance(value, Number):
+		value = value.value
+		return value, value, value
+	if isinstance(value, (int, float)):
+		return value, value, value
+	return None
+
+
+def _as_vec4(value):
+	"""Returns the components of value broadcast to a Vec4 operand,
+	or None if value can't be used as one."""
+	if isinstance(value, Vec4):
+		return value.x, value.y, value.z, value.w
+	if isinstance(value, Vec3):
+		return value.x, value.y, value.z, 0
+	if isinstance(value, Vec2):
+		return value.x, value.y, 0, 0
+	if isinstance(value, Number):
+		value = value.value
+		return value, value, value, value
+	if isinstance(value, (int, float)):
+		return value, value, value, value
+	return None
+
+
 class Vec2(Value):
+	__slots__ = "x", "y"
+
 	type = Vec2Type
 
 	def __init__(self, *xy):
@@ -521,62 +603,62 @@ class Vec2(Value):
 	def rg(self):
 		return self.xy
 
+	def lerp(self, other, t):
+		components = _as_vec2(other)
+		if components is None:
+			return super().lerp(other, t)
+		x, y = components
+		s = 1 - t
+		return _new_vec2(s * self.x + t * x, s * self.y + t * y)
+
 	def __add__(self, other):
-		if isinstance(other, Vec2):
-			return Vec2(self.x + other.x, self.y + other.y)
-		if isinstance(other, Number):
-			return self + Vec2(other.value)
-		if isinstance(other, (int, float)):
-			return self + Vec2(other)
-		return NotImplemented
+		other = _as_vec2(other)
+		if other is None:
+			return NotImplemented
+		x, y = other
+		return _new_vec2(self.x + x, self.y + y)
 
 	__radd__ = __add__
 
 	def __sub__(self, other):
-		if isinstance(other, Vec2):
-			return Vec2(self.x - other.x, self.y - other.y)
-		if isinstance(other, Number):
-			return self - Vec2(other.value)
-		if isinstance(other, (int, float)):
-			return self - Vec2(other)
-		return NotImplemented
+		other = _as_vec2(other)
+		if other is None:
+			return NotImplemented
+		x, y = other
+		return _new_vec2(self.x - x, self.y - y)
 
 	def __rsub__(self, other):
-		if isinstance(other, Number):
-			return Vec2(other.value) - self
-		if isinstance(other, (int, float)):
-			return Vec2(other) - self
-		return NotImplemented
+		other = _as_vec2(other)
+		if other is None:
+			return NotImplemented
+		x, y = other
+		return _new_vec2(x - self.x, y - self.y)
 
 	def __mul__(self, other):
-		if isinstance(other, Vec2):
-			return Vec2(self.x * other.x, self.y * other.y)
-		if isinstance(other, Number):
-			return self * Vec2(other.value)
-		if isinstance(other, (int, float)):
-			return self * Vec2(other)
-		return NotImplemented
+		other = _as_vec2(other)
+		if other is None:
+			return NotImplemented
+		x, y = other
+		return _new_vec2(self.x * x, self.y * y)
 
 	__rmul__ = __mul__
 
 	def __truediv__(self, other):
-		if isinstance(other, Vec2):
-			return Vec2(self.x / other.x, self.y / other.y)
-		if isinstance(other, Number):
-			return self / Vec2(other.value)
-		if isinstance(other, (int, float)):
-			return self / Vec2(other)
-		return NotImplemented
+		other = _as_vec2(other)
+		if other is None:
+			return NotImplemented
+		x, y = other
+		return _new_vec2(self.x / x, self.y / y)
 
 	def __rtruediv__(self, other):
-		if isinstance(other, Number):
-			return Vec2(other.value) / self
-		if isinstance(other, (int, float)):
-			return Vec2(other) / self
-		return NotImplemented
+		other = _as_vec2(other)
+		if other is None:
+			return NotImplemented
+		x, y = other
+		return _new_vec2(x / self.x, y / self.y)
 
 	def __neg__(self):
-		return Vec2(-self.x, -self.y)
+		return _new_vec2(-self.x, -self.y)
 
 	def __iter__(self):
 		yield from self.xy
@@ -586,6 +668,8 @@ class Vec2(Value):
 
 
 class Vec3(Value):
+	__slots__ = "x", "y", "z"
+
 	type = Vec3Type
 
 	def __init__(self, *xyz):
@@ -621,74 +705,62 @@ class Vec3(Value):
 	def rgb(self):
 		return self.xyz
 
+	def lerp(self, other, t):
+		components = _as_vec3(other)
+		if components is None:
+			return super().lerp(other, t)
+		x, y, z = components
+		s = 1 - t
+		return _new_vec3(s * self.x + t * x, s * self.y + t * y, s * self.z + t * z)
+
 	def __add__(self, other):
-		if isinstance(other, Vec3):
-			return Vec3(self.x + other.x, self.y + other.y, self.z + other.z)
-		if isinstance(other, Vec2):
-			return self + Vec3(*other.xy)
-		if isinstance(other, Number):
-			return self + Vec3(other.value)
-		if isinstance(other, (int, float)):
-			return self + Vec3(other)
-		return NotImplemented
+		other = _as_vec3(other)
+		if other is None:
+			return NotImplemented
+		x, y, z = other
+		return _new_vec3(self.x + x, self.y + y, self.z + z)
 
 	__radd__ = __add__
 
 	def __sub__(self, other):
-		if isinstance(other, Vec3):
-			return Vec3(self.x - other.x, self.y - other.y, self.z - other.z)
-		if isinstance(other, Vec2):
-			return self - Vec3(*other.xy)
-		if isinstance(other, Number):
-			return self - Vec3(other.value)
-		if isinstance(other, (int, float)):
-			return self - Vec3(other)
-		return NotImplemented
+		other = _as_vec3(other)
+		if other is None:
+			return NotImplemented
+		x, y, z = other
+		return _new_vec3(self.x - x, self.y - y, self.z - z)
 
 	def __rsub__(self, other):
-		if isinstance(other, Vec2):
-			return Vec3(*other.xy) - self
-		if isinstance(other, Number):
-			return Vec3(other.value) - self
-		if isinstance(other, (int, float)):
-			return Vec3(other) - self
-		return NotImplemented
+		other = _as_vec3(other)
+		if other is None:
+			return NotImplemented
+		x, y, z = other
+		return _new_vec3(x - self.x, y - self.y, z - self.z)
 
 	def __mul__(self, other):
-		if isinstance(other, Vec3):
-			return Vec3(self.x * other.x, self.y * other.y, self.z * other.z)
-		if isinstance(other, Vec2):
-			return self * Vec3(*other.xy)
-		if isinstance(other, Number):
-			return self * Vec3(other.value)
-		if isinstance(other, (int, float)):
-			return self * Vec3(other)
-		return NotImplemented
+		other = _as_vec3(other)
+		if other is None:
+			return NotImplemented
+		x, y, z = other
+		return _new_vec3(self.x * x, self.y * y, self.z * z)
 
 	__rmul__ = __mul__
 
 	def __truediv__(self, other):
-		if isinstance(other, Vec3):
-			return Vec3(self.x / other.x, self.y / other.y, self.z / other.z)
-		if isinstance(other, Vec2):
-			return self / Vec3(*other.xy)
-		if isinstance(other, Number):
-			return self / Vec3(other.value)
-		if isinstance(other, (int, float)):
-			return self / Vec3(other)
-		return NotImplemented
+		other = _as_vec3(other)
+		if other is None:
+			return NotImplemented
+		x, y, z = other
+		return _new_vec3(self.x / x, self.y / y, self.z / z)
 
 	def __rtruediv__(self, other):
-		if isinstance(other, Vec2):
-			return Vec3(*other.xy) / self
-		if isinstance(other, Number):
-			return Vec3(other.value) / self
-		if isinstance(other, (int, float)):
-			return Vec3(other) / self
-		return NotImplemented
+		other = _as_vec3(other)
+		if other is None:
+			return NotImplemented
+		x, y, z = other
+		return _new_vec3(x / self.x, y / self.y, z / self.z)
 
 	def __neg__(self):
-		return Vec3(-self.x, -self.y, -self.z)
+		return _new_vec3(-self.x, -self.y, -self.z)
 
 	def __iter__(self):
 		yield from self.xyz
@@ -697,7 +769,17 @@ class Vec3(Value):
 		return f"{self.__class__.__name__}({self.x}, {self.y}, {self.z})"
 
 
+def pack_rgba(r, g, b, a):
+	"""Packs color components into a 32-bit integer, with r in the lowest
+	and a in the highest byte, which is how Pillow takes integer colors.
+	Components are truncated and clamped to 0-255 like Pillow does."""
+	r, g, b, a = (min(max(int(c), 0), 255) for c in (r, g, b, a))
+	return r | g << 8 | b << 16 | a << 24
+
+
 class Vec4(Value):
+	__slots__ = "x", "y", "z", "w", "_rgba32"
+
 	type = Vec4Type
 
 	def __init__(self, *xyzw):
@@ -743,86 +825,71 @@ class Vec4(Value):
 	def rgba(self):
 		return self.xyzw
 
+	@property
+	def rgba32(self):
+		"""The color packed by pack_rgba(), computed once per vector."""
+		try:
+			return self._rgba32
+		except AttributeError:
+			rgba32 = self._rgba32 = pack_rgba(self.x, self.y, self.z, self.w)
+			return rgba32
+
+	def lerp(self, other, t):
+		components = _as_vec4(other)
+		if components is None:
+			return super().lerp(other, t)
+		x, y, z, w = components
+		s = 1 - t
+		return _new_vec4(s * self.x + t * x, s * self.y + t * y, s * self.z + t * z, s * self.w + t * w)
+
 	def __add__(self, other):
-		if isinstance(other, Vec4):
-			return Vec4(self.x + other.x, self.y + other.y, self.z + other.z, self.w + other.w)
-		if isinstance(other, Vec3):
-			return self + Vec4(*other.xyz)
-		if isinstance(other, Vec2):
-			return self + Vec4(*other.xy)
-		if isinstance(other, Number):
-			return self + Vec4(other.value)
-		if isinstance(other, (int, float)):
-			return self + Vec4(other)
-		return NotImplemented
+		other = _as_vec4(other)
+		if other is None:
+			return NotImplemented
+		x, y, z, w = other
+		return _new_vec4(self.x + x, self.y + y, self.z + z, self.w + w)
 
 	__radd__ = __add__
 
 	def __sub__(self, other):
-		if isinstance(other, Vec4):
-			return Vec4(self.x - other.x, self.y - other.y, self.z - other.z, self.w - other.w)
-		if isinstance(other, Vec3):
-			return self - Vec4(*other.xyz)
-		if isinstance(other, Vec2):
-			return self - Vec4(*other.xy)
-		if isinstance(other, Number):
-			return self - Vec4(other.value)
-		if isinstance(other, (int, float)):
-			return self - Vec4(other)
-		return NotImplemented
+		other = _as_vec4(other)
+		if other is None:
+			return NotImplemented
+		x, y, z, w = other
+		return _new_vec4(self.x - x, self.y - y, self.z - z, self.w - w)
 
 	def __rsub__(self, other):
-		if isinstance(other, Vec3):
-			return Vec4(*other.xyz) - self
-		if isinstance(other, Vec2):
-			return Vec4(*other.xy) - self
-		if isinstance(other, Number):
-			return Vec4(other.value) - self
-		if isinstance(other, (int, float)):
-			return Vec4(other) - self
-		return NotImplemented
+		other = _as_vec4(other)
+		if other is None:
+			return NotImplemented
+		x, y, z, w = other
+		return _new_vec4(x - self.x, y - self.y, z - self.z, w - self.w)
 
 	def __mul__(self, other):
-		if isinstance(other, Vec4):
-			return Vec4(self.x * other.x, self.y * other.y, self.z * other.z, self.w * other.w)
-		if isinstance(other, Vec3):
-			return self * Vec4(*other.xyz)
-		if isinstance(other, Vec2):
-			return self * Vec4(*other.xy)
-		if isinstance(other, Number):
-			return self * Vec4(other.value)
-		if isinstance(other, (int, float)):
-			return self * Vec4(other)
-		return NotImplemented
+		other = _as_vec4(other)
+		if other is None:
+			return NotImplemented
+		x, y, z, w = other
+		return _new_vec4(self.x * x, self.y * y, self.z * z, self.w * w)
 
 	__rmul__ = __mul__
 
 	def __truediv__(self, other):
-		if isinstance(other, Vec4):
-			return Vec4(self.x / other.x, self.y / other.y, self.z / other.z, self.w / other.w)
-		if isinstance(other, Vec3):
-			return self / Vec4(*other.xyz)
-		if isinstance(other, Vec2):
-			return self / Vec4(*other.xy)
-		if isinstance(other, Number):
-			return self / Vec4(other.value)
-		if isinstance(other, (int, float)):
-			return self / Vec4(other)
-		return NotImplemented
+		other = _as_vec4(other)
+		if other is None:
+			return NotImplemented
+		x, y, z, w = other
+		return _new_vec4(self.x / x, self.y / y, self.z / z, self.w / w)
 
 	def __rtruediv__(self, other):
-		if isinstance(other, Vec3):
-			return Vec4(*other.xyz) / self
-		if isinstance(other, Vec2):
-			return Vec4(*other.xy) / self
-		if isinstance(other, Number):
-			return Vec4(other.value) / self
-		if isinstance(other, (int, float)):
-			return Vec4(other) / self
-		return NotImplemented
+		other = _as_vec4(other)
+		if other is None:
+			return NotImplemented
+		x, y, z, w = other
+		return _new_vec4(x / self.x, y / self.y, z / self.z, w / self.w)
 
 	def __neg__(self):
-		return Vec4(-self.x, -self.y, -self.z, -self.w)
+		return _new_vec4(-self.x, -self.y, -self.z, -self.w)
 
 	def __iter__(self):
 		yield from self.xyzw
@@ -831,7 +898,30 @@ class Vec4(Value):
 		return f"{self.__class__.__name__}({self.x}, {self.y}, {self.z}, {self.w})"
 
 
+# Results of arithmetic are created without the checks in __init__,
+# as their components are already known to be numbers
+
+def _new_vec2(x, y):
+	vec = object.__new__(Vec2)
+	vec.x, vec.y = x, y
+	return vec
+
+
+def _new_vec3(x, y, z):
+	vec = object.__new__(Vec3)
+	vec.x, vec.y, vec.z = x, y, z
+	return vec
+
+
+def _new_vec4(x, y, z, w):
+	vec = object.__new__(Vec4)
+	vec.x, vec.y, vec.z, vec.w = x, y, z, w
+	return vec
+
+
 class Color(Vec4):
+	__slots__ = ()
+
 	def __init__(self, r=0, g=None, b=None, a=255):
 		if b is None:
 			b = r if g is None else 0
@@ -841,6 +931,12 @@ class Color(Vec4):
 		super().__init__(r, g, b, a)
 
 
+# Colors shared by the default properties of every element
+Transparent = Vec4(0, 0, 0, 0)
+Black = Vec4(0, 0, 0, 255)
+White = Vec4(255, 255, 255, 255)
+
+
 class _Rect(Type):
 	def __add__(self, other):
 		if other in (Vec2Type, NumberType):
@@ -856,10 +952,12 @@ RectType = _Rect()
 
 
 class Point(Vec2):
-	pass
+	__slots__ = ()
 
 
 class Size(Vec2):
+	__slots__ = ()
+
 	@property
 	def width(self):
 		return self.x
@@ -882,6 +980,8 @@ class Size(Vec2):
 
 
 class Rect(Value):
+	__slots__ = "position", "size"
+
 	type = RectType
 
 	def __init__(self, *rect):
@@ -940,15 +1040,32 @@ class Rect(Value):
 		return f"{self.__class__.__name__}({self.position!r}, {self.size!r})"
 
 
+_binary_operators = {
+	"+": operator.add,
+	"-": operator.sub,
+	"*": operator.mul,
+	"/": operator.truediv,
+	"//": operator.floordiv,
+	"%": operator.mod,
+}
+
+
 class Expression(Value):
+	__slots__ = ()
+
 	def eval(self):
 		raise NotImplementedError
 
+	def compile(self):
+		raise NotImplementedError
+
 	def apply(self, relative):
 		raise NotImplementedError
 
 
 class BinOp(Expression):
+	__slots__ = "op", "lhs", "rhs"
+
 	def __init__(self, op, lhs, rhs):
 		assert op in ("+", "-", "*", "/", "//", "%")
 		assert isinstance(lhs, Value)
@@ -985,6 +1102,22 @@ class BinOp(Expression):
 		if self.op == "%":
 			return self.lhs.eval() % self.rhs.eval()
 
+	def compile(self):
+		if self.type is NumberType:
+			# Only box the result, not every intermediate value
+			evaluate = self.compile_unboxed()
+			return lambda: Number(evaluate())
+		op = _binary_operators[self.op]
+		lhs, rhs = self.lhs.compile(), self.rhs.compile()
+		return lambda: op(lhs(), rhs())
+
+	def compile_unboxed(self):
+		if self.lhs.type is not NumberType or self.rhs.type is not NumberType:
+			return super().compile_unboxed()
+		op = _binary_operators[self.op]
+		lhs, rhs = self.lhs.compile_unboxed(), self.rhs.compile_unboxed()
+		return lambda: op(lhs(), rhs())
+
 	def apply(self, relative):
 		self.lhs.apply(relative)
 		self.rhs.apply(relative)
@@ -998,6 +1131,8 @@ class BinOp(Expression):
 
 
 class UnaryOp(Expression):
+	__slots__ = "op", "operand"
+
 	def __init__(self, op, operand):
 		assert op == "-"
 		assert isinstance(operand, Value)
@@ -1011,6 +1146,19 @@ class UnaryOp(Expression):
 	def eval(self):
 		return -self.operand.eval()
 
+	def compile(self):
+		if self.type is NumberType:
+			evaluate = self.compile_unboxed()
+			return lambda: Number(evaluate())
+		operand = self.operand.compile()
+		return lambda: -operand()
+
+	def compile_unboxed(self):
+		if self.operand.type is not NumberType:
+			return super().compile_unboxed()
+		operand = self.operand.compile_unboxed()
+		return lambda: -operand()
+
 	def apply(self, relative):
 		self.operand.apply(relative)
 
@@ -1022,6 +1170,8 @@ class UnaryOp(Expression):
 
 
 class Call(Expression):
+	__slots__ = "func", "args"
+
 	def __init__(self, func, args=()):
 		self.func = func
 		self.args = tuple(args)
@@ -1034,6 +1184,32 @@ class Call(Expression):
 	def eval(self):
 		return self.func(*(arg.eval() for arg in self.args))
 
+	def compile(self):
+		func = self.func
+		args = tuple(arg.compile() for arg in self.args)
+
+		wrapped = getattr(func, "__wrapped__", None)
+		if wrapped is None:
+			return lambda: func(*[arg() for arg in args])
+
+		# The arguments were type checked when the call was created, so the
+		# checking wrapper is skipped. The checks are only repeated to raise
+		# its errors, if an argument or the result has an unexpected type.
+		parameter_types, return_type = func.parameter_types, func.return_type
+		type_check, check_result = func.type_check, func.check_result
+
+		def call():
+			values = [arg() for arg in args]
+			for value, type in zip(values, parameter_types):
+				if value.type is not type:
+					type_check(values)
+			result = wrapped(*values)
+			if not isinstance(result, Value) or result.type is not return_type:
+				check_result(result)
+			return result
+
+		return call
+
 	def apply(self, relative):
 		for arg in self.args:
 			arg.apply(relative)
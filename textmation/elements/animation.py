@@ -1,13 +1,17 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from itertools import islice
+from bisect import bisect_right
 from functools import total_ordering
-from math import isinf
+from math import isinf, inf
 from enum import IntEnum
 
 from ..datatypes import Time, TimeUnit
-from .element import Element, ElementError
+from .element import Element, ElementError, DerivedValue
+
+
+# Shared by every animation and keyframe, which declare it as default
+_zero_time = Time(0, TimeUnit.Seconds)
 
 
 def is_int(x):
@@ -60,11 +64,102 @@ class AnimationFillMode(IntEnum):
 	Default = Never
 
 
+def _lookup_enum(enum, name, property_name):
+	try:
+		return enum[name]
+	except KeyError:
+		names = ", ".join(repr(member.name) for member in enum if member.name != "Default")
+		raise ElementError(f"Unexpected {property_name} {name!r}, expected any of {names}") from None
+
+
+class AnimationSchedule:
+	"""The timing of an animation, with the enums resolved and all times
+	converted to seconds, such that sampling only reads plain floats.
+
+	The schedule is immutable. The animation creates a new one if its
+	properties or the times of its keyframes are changed.
+	"""
+
+	__slots__ = "keyframe_times", "delay", "iterations", "infinite_iterations", "integer_iterations", \
+		"direction", "fill_mode", "begin_time", "end_time", "iteration_duration", "duration", "window"
+
+	def __init__(self, animation):
+		keyframes = animation.keyframes
+
+		self.keyframe_times = tuple(keyframe.time.seconds for keyframe in keyframes)
+
+		delay = animation.p_delay
+		self.delay = delay.seconds
+
+		iterations = animation.p_iterations
+		self.iterations = iterations
+		self.infinite_iterations = isinf(iterations)
+		self.integer_iterations = is_int(iterations)
+
+		self.direction = _lookup_enum(AnimationDirection, animation.p_direction, "direction")
+		self.fill_mode = _lookup_enum(AnimationFillMode, animation.p_fill_mode, "fill_mode")
+
+		self.begin_time = (keyframes[0].time + delay).seconds
+		self.iteration_duration = self.keyframe_times[-1] - self.keyframe_times[0]
+
+		if self.infinite_iterations:
+			self.end_time = self.begin_time
+		else:
+			self.end_time = self.begin_time + self.iteration_duration * iterations
+
+		self.duration = self.end_time - self.begin_time
+
+		self.window = self._window()
+
+	def _window(self):
+		"""Returns the lower and upper time, between which (inclusive)
+		the animation is affecting, see is_affecting()."""
+		fill_mode = self.fill_mode
+
+		if fill_mode == AnimationFillMode.Always:
+			return -inf, inf
+
+		if self.infinite_iterations:
+			return self.begin_time, inf
+
+		if fill_mode == AnimationFillMode.Never:
+			return self.begin_time, self.end_time
+		if fill_mode == AnimationFillMode.After:
+			return self.begin_time, inf
+		if fill_mode == AnimationFillMode.Before:
+			return -inf, self.end_time
+
+		return inf, -inf
+
+	def is_affecting(self, time):
+		fill_mode = self.fill_mode
+
+		if fill_mode == AnimationFillMode.Always:
+			return True
+
+		if self.infinite_iterations:
+			return time >= self.begin_time
+
+		if fill_mode == AnimationFillMode.Never:
+			return self.begin_time <= time <= self.end_time
+		if fill_mode == AnimationFillMode.After:
+			return time >= self.begin_time
+		if fill_mode == AnimationFillMode.Before:
+			return time <= self.end_time
+
+		return False
+
+	def __repr__(self):
+		return f"<{self.__class__.__name__}: {self.begin_time}s to {self.end_time}s, {self.direction.name}, {self.fill_mode.name}>"
+
+
 class Animation(Element):
 	def __init__(self):
 		super().__init__()
 		self.element_properties = None
 		self.keyframes = []
+		self._schedule = DerivedValue()
+		self._cursor = 1
 		# self._duration = Time(0, TimeUnit.Seconds)
 
 	def on_ready(self):
@@ -74,7 +169,7 @@ class Animation(Element):
 
 		# self.define("duration", self._duration)
 
-		self.define("delay", Time(0, TimeUnit.Seconds))
+		self.define("delay", _zero_time)
 
 		self.define("iterations", 1)
 
@@ -105,49 +200,65 @@ class Animation(Element):
 				keyframe.set(name, self.element.get(name).get())
 				# TODO: Check if the property value can be interpolated
 
+		# Also reports invalid properties while building
+		self.schedule
+
 	def compute(self, time):
 		super().compute(time)
+		self.sample(time, self.element.animate)
 
-		if not self.is_affecting(time):
+	def sample(self, time, animate):
+		"""Calls animate(name, value) for each property of the element,
+		which the animation affects at time."""
+		schedule = self.schedule
+
+		if not schedule.is_affecting(time):
 			return
 
-		time = max(time - self.p_delay.seconds, 0)
+		time = max(time - schedule.delay, 0)
+
+		duration = schedule.duration
+		iteration_duration = schedule.iteration_duration
+		direction = schedule.direction
 
-		is_after = not self.infinite_iterations and time >= self.duration
+		is_after = not schedule.infinite_iterations and time >= duration
 
-		if not self.infinite_iterations:
-			time = min(time, self.duration)
+		if not schedule.infinite_iterations:
+			time = min(time, duration)
 
-		if self.direction in (AnimationDirection.Normal, AnimationDirection.Reverse):
-			time %= self.iteration_duration
-			if self.direction == AnimationDirection.Reverse:
-				time = self.iteration_duration - time
-		elif self.direction == AnimationDirection.Alternate:
-			time = ping_pong(time, 0, self.iteration_duration)
-		elif self.direction == AnimationDirection.AlternateReverse:
-			time = ping_pong(time + self.iteration_duration, 0, self.iteration_duration)
+		if direction in (AnimationDirection.Normal, AnimationDirection.Reverse):
+			time %= iteration_duration
+			if direction == AnimationDirection.Reverse:
+				time = iteration_duration - time
+		elif direction == AnimationDirection.Alternate:
+			time = ping_pong(time, 0, iteration_duration)
+		elif direction == AnimationDirection.AlternateReverse:
+			time = ping_pong(time + iteration_duration, 0, iteration_duration)
 
-		before, after = self.get_between(time)
+		before, after = self._find_between(time)
 
-		if is_after and is_int(self.iterations):
-			if self.fill_mode in (AnimationFillMode.After, AnimationFillMode.Always):
-				if self.direction == AnimationDirection.Normal:
-					after = self.keyframes[-1]
+		if is_after and schedule.integer_iterations:
+			if schedule.fill_mode in (AnimationFillMode.After, AnimationFillMode.Always):
+				if direction == AnimationDirection.Normal:
+					after = len(self.keyframes) - 1
 					before = after
-				elif self.direction == AnimationDirection.Reverse:
-					after = self.keyframes[0]
+				elif direction == AnimationDirection.Reverse:
+					after = 0
 					before = after
 
+		times = schedule.keyframe_times
+		before_keyframe, after_keyframe = self.keyframes[before], self.keyframes[after]
+
 		if before == after:
 			for name in self.element_properties:
-				self.element.set_computed(name, before.eval(name))
+				animate(name, before_keyframe.eval(name))
 		else:
-			time = normalize(time, before.time.seconds, after.time.seconds)
+			time = normalize(time, times[before], times[after])
 
 			for name in self.element_properties:
-				before_value = before.eval(name)
-				after_value = after.eval(name)
-				self.element.set_computed(name, lerp(before_value, after_value, time))
+				before_value = before_keyframe.eval(name)
+				after_value = after_keyframe.eval(name)
+				animate(name, before_value.lerp(after_value, time))
 
 	def add(self, keyframe):
 		super().add(keyframe)
@@ -161,74 +272,89 @@ class Animation(Element):
 	def element(self):
 		return self.parent
 
+	@property
+	def schedule(self):
+		schedule = self._schedule.get()
+		if schedule is None:
+			# The schedule is derived again once the timing of the animation
+			# or its keyframes changes, e.g. if the delay is an expression of
+			# other properties. Shared defaults are replaced with copies,
+			# which can be assigned.
+			inputs = [self.get(name) for name in ("delay", "iterations", "direction", "fill_mode")]
+			inputs.extend(keyframe.get("time") for keyframe in self.keyframes)
+			schedule = AnimationSchedule(self)
+			self._schedule.set(schedule, inputs)
+			self._cursor = 1
+		return schedule
+
 	@property
 	def duration(self):
 		# return self.p_duration.seconds
-		return self.end_time - self.begin_time
+		return self.schedule.duration
 
 	@property
 	def begin_time(self):
-		return (self.keyframes[0].time + self.p_delay).seconds
+		return self.schedule.begin_time
 
 	@property
 	def end_time(self):
-		# return self.begin_time + self.duration
-		iterations = self.p_iterations
-		if isinf(iterations):
-			return self.begin_time
-		return self.begin_time + self.iteration_duration * iterations
+		return self.schedule.end_time
 
 	@property
 	def iteration_duration(self):
-		first = self.keyframes[0].time.seconds
-		last  = self.keyframes[-1].time.seconds
-		duration = last - first
-		return duration
+		return self.schedule.iteration_duration
 
 	@property
 	def iterations(self):
-		return self.p_iterations
+		return self.schedule.iterations
 
 	@property
 	def infinite_iterations(self):
-		return isinf(self.iterations)
+		return self.schedule.infinite_iterations
 
 	@property
 	def direction(self):
-		return AnimationDirection[self.p_direction]
+		return self.schedule.direction
 
 	@property
 	def fill_mode(self):
-		return AnimationFillMode[self.p_fill_mode]
+		return self.schedule.fill_mode
 
-	def get_between(self, time):
-		first = self.keyframes[0]
-		if time < first.time.seconds:
-			return first, first
+	@property
+	def keyframe_times(self):
+		"""The times of the keyframes in seconds, in order."""
+		return self.schedule.keyframe_times
 
-		last = self.keyframes[-1]
-		if time >= last.time.seconds:
-			return last, last
+	def _find_between(self, time):
+		times = self.schedule.keyframe_times
 
-		for i, keyframe in enumerate(islice(self.keyframes, 1, None), start=1):
-			if time < keyframe.time.seconds:
-				return self.keyframes[i - 1], keyframe
+		if time < times[0]:
+			return 0, 0
 
-	def is_affecting(self, time):
-		if self.fill_mode == AnimationFillMode.Always:
-			return True
+		last = len(times) - 1
+		if time >= times[last]:
+			return last, last
 
-		if self.infinite_iterations:
-			return time >= self.begin_time
+		# Frames are usually sampled in order, so the keyframes found last
+		# and the ones after them are checked, before searching all of them.
+		# The index is of the first keyframe after time.
+		i = self._cursor
+		if not times[i - 1] <= time < times[i]:
+			if times[i] <= time < times[i + 1]:
+				i += 1
+			else:
+				i = bisect_right(times, time)
+			self._cursor = i
 
-		if self.fill_mode == AnimationFillMode.Never:
-			return self.begin_time <= time <= self.end_time
-		if self.fill_mode == AnimationFillMode.After:
-			return time >= self.begin_time
-		if self.fill_mode == AnimationFillMode.Before:
-			return time <= self.end_time
+		return i - 1, i
 
-		return False
+	def get_between(self, time):
+		"""Returns the keyframes before and after time."""
+		before, after = self._find_between(time)
+		return self.keyframes[before], self.keyframes[after]
+
+	def is_affecting(self, time):
+		return self.schedule.is_affecting(time)
 
 
 @total_ordering
@@ -240,7 +366,7 @@ class Keyframe(Element):
 	def on_ready(self):
 		super().on_ready()
 
-		self.define("time", Time(0, TimeUnit.Seconds))
+		self.define("time", _zero_time)
 
 	def compute(self, time):
 		# Keyframe is transparently setting properties to its element
@@ -27,7 +27,13 @@ class Drawable(BaseDrawable):
 	def on_ready(self):
 		super().on_ready()
 
-		self.define("index", self.parent.children.index(self))
+		# Elements are usually ready right after being added,
+		# so avoid searching every sibling of large scenes
+		children = self.parent.children
+		index = len(children) - 1
+		if children[index] is not self:
+			index = children.index(self)
+		self.define("index", index)
 
 		self.define("x", 0, relative="width")
 		self.define("y", 0, relative="height")
@@ -39,10 +45,10 @@ class Rectangle(Drawable):
 	def on_ready(self):
 		super().on_ready()
 
-		self.define("color", Vec4(255, 255, 255, 255))
+		self.define("color", White)
 		self.define("fill", self.get("color"))
 
-		self.define("outline", Vec4(0, 0, 0, 0), Vec4)
+		self.define("outline", Transparent, Vec4)
 		self.define("outline_width", 1)
 
 
@@ -50,27 +56,27 @@ class Circle(Drawable):
 	def on_ready(self):
 		super().on_ready()
 
-		self.define("center_x", BinOp("-", Percentage(50), BinOp("/", self.get("width"), Number(2))), relative="width")
-		self.define("center_y", BinOp("-", Percentage(50), BinOp("/", self.get("height"), Number(2))), relative="height")
+		self.define("center_x", BinOp("-", Percentage(50), BinOp("/", self.get("width"), intern_number(2))), relative="width")
+		self.define("center_y", BinOp("-", Percentage(50), BinOp("/", self.get("height"), intern_number(2))), relative="height")
 
 		# TODO: Should radius be relative to width, height, min(width, height) or max(width, height)
 		# self.define("radius", Percentage(50), relative="width")
 		self.define("diameter", Percentage(100), relative="width")
-		self.define("radius", BinOp("/", self.get("diameter"), Number(2)), relative="width")
+		self.define("radius", BinOp("/", self.get("diameter"), intern_number(2)), relative="width")
 
 		# self.set("x", BinOp("-", self.get("center_x"), self.get("radius")))
-		self.set("x", BinOp("-", self.get("center_x"), BinOp("/", self.get("width"), Number(2))))
+		self.set("x", BinOp("-", self.get("center_x"), BinOp("/", self.get("width"), intern_number(2))))
 
 		# self.set("y", BinOp("-", self.get("center_y"), self.get("radius")))
-		self.set("y", BinOp("-", self.get("center_y"), BinOp("/", self.get("height"), Number(2))))
+		self.set("y", BinOp("-", self.get("center_y"), BinOp("/", self.get("height"), intern_number(2))))
 
-		self.set("width", BinOp("*", self.get("radius"), Number(2)))
-		self.set("height", BinOp("*", self.get("radius"), Number(2)))
+		self.set("width", BinOp("*", self.get("radius"), intern_number(2)))
+		self.set("height", BinOp("*", self.get("radius"), intern_number(2)))
 
-		self.define("color", Vec4(255, 255, 255, 255))
+		self.define("color", White)
 		self.define("fill", self.get("color"))
 
-		self.define("outline", Vec4(0, 0, 0, 0), Vec4)
+		self.define("outline", Transparent, Vec4)
 		self.define("outline_width", 1)
 
 
@@ -78,32 +84,32 @@ class Ellipse(Drawable):
 	def on_ready(self):
 		super().on_ready()
 
-		self.define("center_x", BinOp("-", Percentage(50), BinOp("/", self.get("width"), Number(2))), relative="width")
-		self.define("center_y", BinOp("-", Percentage(50), BinOp("/", self.get("height"), Number(2))), relative="height")
+		self.define("center_x", BinOp("-", Percentage(50), BinOp("/", self.get("width"), intern_number(2))), relative="width")
+		self.define("center_y", BinOp("-", Percentage(50), BinOp("/", self.get("height"), intern_number(2))), relative="height")
 
 		# TODO: Should radius be relative to width, height, min(width, height) or max(width, height)
 		# self.define("radius", Percentage(50), relative="width")
 		self.define("diameter", Percentage(100), relative="width")
-		self.define("radius", BinOp("/", self.get("diameter"), Number(2)), relative="width")
+		self.define("radius", BinOp("/", self.get("diameter"), intern_number(2)), relative="width")
 
 		self.define("diameter_x", self.get("diameter"), relative="width")
 		self.define("diameter_y", self.get("diameter"), relative="height")
-		self.define("radius_x", BinOp("/", self.get("diameter_x"), Number(2)), relative="width")
-		self.define("radius_y", BinOp("/", self.get("diameter_y"), Number(2)), relative="height")
+		self.define("radius_x", BinOp("/", self.get("diameter_x"), intern_number(2)), relative="width")
+		self.define("radius_y", BinOp("/", self.get("diameter_y"), intern_number(2)), relative="height")
 
 		# self.set("x", BinOp("-", self.get("center_x"), self.get("radius_x")))
-		self.set("x", BinOp("-", self.get("center_x"), BinOp("/", self.get("width"), Number(2))))
+		self.set("x", BinOp("-", self.get("center_x"), BinOp("/", self.get("width"), intern_number(2))))
 
 		# self.set("y", BinOp("-", self.get("center_y"), self.get("radius_y")))
-		self.set("y", BinOp("-", self.get("center_y"), BinOp("/", self.get("height"), Number(2))))
+		self.set("y", BinOp("-", self.get("center_y"), BinOp("/", self.get("height"), intern_number(2))))
 
-		self.set("width", BinOp("*", self.get("radius_x"), Number(2)))
-		self.set("height", BinOp("*", self.get("radius_y"), Number(2)))
+		self.set("width", BinOp("*", self.get("radius_x"), intern_number(2)))
+		self.set("height", BinOp("*", self.get("radius_y"), intern_number(2)))
 
-		self.define("color", Vec4(255, 255, 255, 255))
+		self.define("color", White)
 		self.define("fill", self.get("color"))
 
-		self.define("outline", Vec4(0, 0, 0, 0), Vec4)
+		self.define("outline", Transparent, Vec4)
 		self.define("outline_width", 1)
 
 
@@ -128,7 +134,7 @@ class Line(Drawable):
 		self.set("x", self.get("x1"))
 		self.set("y", self.get("y1"))
 
-		self.define("color", Vec4(255, 255, 255, 255))
+		self.define("color", White)
 		self.define("fill", self.get("color"))
 
 		# TODO: Intersects with Drawable's width
@@ -152,5 +158,5 @@ class Text(Drawable):
 		self.define("anchor", "Center")
 		self.define("alignment", "Left")
 
-		self.define("color", Vec4(255, 255, 255, 255))
+		self.define("color", White)
 		self.define("fill", self.get("color"))
@@ -4,11 +4,14 @@
 from contextlib import contextmanager
 from operator import attrgetter
 
-from ..datatypes import Type, Value, Number, String
+from ..datatypes import Type, Value, Number, NumberType, String, Expression, intern_number
+from ..datatypes import Angle, Time, Vec2, Vec3, Vec4
 from ..utilities import iter_all_subclasses
 
 
 class Percentage(Number):
+	__slots__ = "relative",
+
 	def __init__(self, value):
 		super().__init__(value)
 		self.relative = None
@@ -16,7 +19,19 @@ class Percentage(Number):
 	def eval(self):
 		assert isinstance(self.relative, ElementProperty)
 		# return BinOp("*", self.relative.eval(), BinOp("/", Number(self.value), Number(100))).eval()
-		return self.relative.eval() * (self / Number(100))
+		return self.relative.eval() * (self.value / 100)
+
+	def compile(self):
+		assert isinstance(self.relative, ElementProperty)
+		relative, factor = self.relative.eval, self.value / 100
+		return lambda: relative() * factor
+
+	def compile_unboxed(self):
+		assert isinstance(self.relative, ElementProperty)
+		if self.relative.type is not NumberType:
+			return super().compile_unboxed()
+		relative, factor = self.relative.eval_unboxed, self.value / 100
+		return lambda: relative() * factor
 
 	def apply(self, relative):
 		assert isinstance(relative, ElementProperty)
@@ -57,17 +72,100 @@ def find_cycles(value):
 	return paths
 
 
+def collect_inputs(value):
+	"""Returns the properties directly referenced by value, and the
+	properties percentages in value are relative to."""
+	if not isinstance(value, (Expression, ElementProperty, Percentage)):
+		return (), ()
+
+	dependencies, relatives = [], []
+
+	stack = [value]
+	while stack:
+		value = stack.pop()
+		if isinstance(value, ElementProperty):
+			dependencies.append(value)
+		else:
+			if isinstance(value, Percentage) and value.relative is not None:
+				relatives.append(value.relative)
+			stack.extend(value.iter_values())
+
+	return tuple(dependencies), tuple(relatives)
+
+
+def is_reachable(properties, target):
+	"""Returns whether target is reachable from any of properties
+	by following the dependency graph.
+
+	Every property is visited at most once, so the cost is
+	proportional to the region of the graph reachable from properties.
+	"""
+	visited = set()
+	stack = list(properties)
+	while stack:
+		property = stack.pop()
+		if property is target:
+			return True
+		if property in visited:
+			continue
+		visited.add(property)
+		stack.extend(property.dependencies)
+	return False
+
+
+class EvaluationCounters:
+	"""Counts property evaluations, along with the evaluations skipped
+	because the property's memoised value was still valid, and the
+	assignments skipped because the value was unchanged."""
+
+	__slots__ = "evaluated", "skipped", "unchanged"
+
+	def __init__(self):
+		self.reset()
+
+	def reset(self):
+		self.evaluated = 0
+		self.skipped = 0
+		self.unchanged = 0
+
+	def __repr__(self):
+		return f"<{self.__class__.__name__}: evaluated={self.evaluated}, skipped={self.skipped}, unchanged={self.unchanged}>"
+
+
+evaluation_counters = EvaluationCounters()
+
+
+def _resolve_types(types):
+	if not isinstance(types, tuple):
+		types = types,
+	return tuple(type if isinstance(type, Type) else type.type for type in types)
+
+
+# Every element of a class declares the same properties with the same
+# types, so the resolved tuples are shared instead of built per property
+_resolved_types = {}
+
+
+def lookup_types(types):
+	try:
+		return _resolved_types[types]
+	except KeyError:
+		resolved = _resolved_types[types] = _resolve_types(types)
+		return resolved
+
+
 class ElementProperty(Value):
+	__slots__ = "name", "value", "dependencies", "inputs", "dependents", \
+		"_unboxed", "_cache", "_boxed", "_evaluate", "types", "relative"
+
 	def __init__(self, name, value, types=None, *, relative=None):
 		assert isinstance(name, str)
 		assert isinstance(value, Value)
 
 		if types is None:
-			types = value.type,
-		elif not isinstance(types, tuple):
-			types = types,
+			types = value.type
 
-		types = tuple(type if isinstance(type, Type) else type.type for type in types)
+		types = lookup_types(types)
 
 		assert isinstance(types, tuple)
 		assert len(types) > 0
@@ -76,32 +174,98 @@ class ElementProperty(Value):
 
 		self.name = name
 		self.value = None
+		self.dependencies = ()
+		# Properties the value is evaluated from, and the reverse edges
+		self.inputs = ()
+		self.dependents = None
+		# Number properties are evaluated and memoised unboxed,
+		# and only boxed when eval() is called
+		self._unboxed = False
+		self._cache = None
+		self._boxed = None
+		self._evaluate = None
 		self.types = types
 		self.relative = relative
 
-		self.set(value)
+		# Nothing references a new property yet, so it can't be part of a cycle
+		self._set(self._box(value))
 
 	@property
 	def type(self):
+		# The value is checked against types, so a single
+		# type can be returned without inspecting the value
+		if len(self.types) == 1:
+			return self.types[0]
 		return self.value.type
 
 	def get(self):
 		return self.value
 
-	def set(self, value):
+	@staticmethod
+	def _box(value):
 		if isinstance(value, (int, float)):
-			value = Number(value)
+			return intern_number(value)
 		elif isinstance(value, str):
-			value = String(value)
+			return String(value)
+		return value
+
+	def set(self, value):
+		value = self._box(value)
+
+		if value is self.value:
+			evaluation_counters.unchanged += 1
+			return
+
+		dependencies = self._set(value)
 
+		# Adding the edges self -> dependencies creates a cycle only
+		# if self is reachable from one of them. Finding every path
+		# is expensive, so it's only done to report the error.
+		if dependencies and is_reachable(dependencies, self):
+			raise CircularReferenceError(f"Circular dependency encountered", find_cycles(self))
+
+	def _set(self, value):
 		self.check_value(value)
 
 		self.value = value
 		self.value.apply(self.relative)
+		self._unboxed = self.type is NumberType
+		self._evaluate = None
+
+		dependencies, relatives = collect_inputs(value)
+		self.dependencies = dependencies
+
+		for input in self.inputs:
+			input.dependents.discard(self)
+
+		self.inputs = inputs = dependencies + relatives
+
+		for input in inputs:
+			if input.dependents is None:
+				input.dependents = set()
+			input.dependents.add(self)
+
+		self.invalidate()
 
-		paths = find_cycles(self)
-		if paths:
-			raise CircularReferenceError(f"Circular dependency encountered", paths)
+		return dependencies
+
+	def invalidate(self):
+		"""Discards the memoised value of this property and every property
+		evaluated from it.
+
+		A property is only memoised after its inputs are, so propagation
+		stops at properties which are already dirty.
+		"""
+		self._cache = None
+
+		stack = list(self.dependents or ())
+		while stack:
+			property = stack.pop()
+			if property._cache is None:
+				continue
+			property._cache = None
+			if property.dependents:
+				stack.extend(property.dependents)
 
 	def check_value(self, value):
 		if isinstance(value, (int, float)):
@@ -115,8 +279,59 @@ class ElementProperty(Value):
 			type_names = ", ".join(map(attrgetter("name"), self.types))
 			raise TypeError(f"Expected type of {type_names}, received {value.type.name}")
 
+	def _evaluate_cache(self):
+		evaluation_counters.evaluated += 1
+		evaluate = self._evaluate
+		if evaluate is None:
+			# Most values are only evaluated once, e.g. when frozen, so the
+			# value is only compiled if it is evaluated again. This avoids
+			# keeping closures alive for every property of every element.
+			self._evaluate = False
+			value = self.value.eval()
+			if self._unboxed:
+				value = value.unbox()
+		else:
+			if evaluate is False:
+				if self._unboxed:
+					evaluate = self.value.compile_unboxed()
+				else:
+					evaluate = self.value.compile()
+				self._evaluate = evaluate
+			value = evaluate()
+		self._boxed = None
+		self._cache = value
+		return value
+
 	def eval(self):
-		return self.value.eval()
+		value = self._cache
+		if value is None:
+			value = self._evaluate_cache()
+		else:
+			evaluation_counters.skipped += 1
+		if self._unboxed:
+			boxed = self._boxed
+			if boxed is None:
+				boxed = self._boxed = intern_number(value)
+			return boxed
+		return value
+
+	def eval_unboxed(self):
+		"""Like eval().unbox(), but Number values are never boxed."""
+		value = self._cache
+		if value is None:
+			value = self._evaluate_cache()
+		else:
+			evaluation_counters.skipped += 1
+		if self._unboxed:
+			return value
+		return value.unbox()
+
+	def compile(self):
+		# References stay dynamic, such that they follow changes
+		return self.eval
+
+	def compile_unboxed(self):
+		return self.eval_unboxed
 
 	def iter_values(self):
 		yield self.value
@@ -125,6 +340,89 @@ class ElementProperty(Value):
 		return f"<{self.__class__.__name__}: {self.name!r}, {self.value!r}>"
 
 
+class PrototypeProperty(ElementProperty):
+	"""A default shared by every element of a class, which declares
+	it in on_ready() with the same constant value.
+
+	Element.get() replaces it with a copy the first time the element's
+	property is referenced or assigned, so it's never assigned itself,
+	and nothing depends on it.
+	"""
+
+	__slots__ = ()
+
+	def set(self, value):
+		raise TypeError(f"Cannot assign shared property {self.name!r}")
+
+
+class DerivedValue:
+	"""A value memoised from properties, or other derived values,
+	which is discarded whenever any of them is invalidated.
+
+	It's added to their dependents, such that ElementProperty.invalidate()
+	propagates to it, and from it to its own dependents.
+	"""
+
+	__slots__ = "_cache", "dependents"
+
+	def __init__(self):
+		self._cache = None
+		self.dependents = None
+
+	def get(self):
+		"""Returns the memoised value, or None if it has to be derived again."""
+		return self._cache
+
+	def set(self, value, inputs):
+		"""Memoises value derived from inputs, which must be evaluated,
+		such that invalidating them propagates to it."""
+		assert value is not None
+		for input in inputs:
+			if input.dependents is None:
+				input.dependents = set()
+			input.dependents.add(self)
+		self._cache = value
+
+
+# Values which can be shared between elements, as they never change
+# and don't reference other properties (unlike Percentage)
+_constant_types = Number, String, Angle, Time, Vec2, Vec3, Vec4
+
+
+def _is_same_constant(a, b):
+	if a is b:
+		return True
+	# Numbers and strings aren't always interned
+	if a.__class__ is b.__class__ and a.__class__ in (Number, String):
+		a, b = a.unbox(), b.unbox()
+		return type(a) is type(b) and a == b
+	return False
+
+
+def _create_prototype(name, value, types, relative):
+	if relative is None and isinstance(value, _constant_types) and not isinstance(value, Percentage):
+		return PrototypeProperty(name, value, types)
+	return None
+
+
+class PropertyAccessor:
+	"""Class attribute resolving element.p_name to the unboxed computed
+	value of the element's property, without Element.__getattr__."""
+
+	__slots__ = "name",
+
+	def __init__(self, name):
+		self.name = name
+
+	def __get__(self, element, cls=None):
+		if element is None:
+			return self
+		return element.computed_properties[self.name].eval_unboxed()
+
+	def __repr__(self):
+		return f"<{self.__class__.__name__}: {self.name!r}>"
+
+
 class _Element(Type):
 	pass
 
@@ -144,6 +442,9 @@ class Element(Value):
 		self.computed_properties = {}
 		self.children = []
 		self.parent = None
+		self._frozen = None
+		self._samples = None
+		self._declaring = False
 
 	def on_init(self):
 		pass
@@ -161,12 +462,25 @@ class Element(Value):
 	def on_created(self):
 		pass
 
+	def ready(self):
+		"""Calls on_ready(), marking the properties it defines as the
+		defaults every element of the class declares.
+
+		Defaults declared with the same constant value as by the first
+		element of the class share a PrototypeProperty.
+		"""
+		self._declaring = True
+		try:
+			self.on_ready()
+		finally:
+			self._declaring = False
+
 	def define(self, name, value, types=None, *, relative=None):
 		if name in self.properties:
 			raise ElementPropertyDefinedError(f"Property {name!r} is already defined")
 
 		if isinstance(value, (int, float)):
-			value = Number(value)
+			value = intern_number(value)
 		elif isinstance(value, str):
 			value = String(value)
 
@@ -176,26 +490,68 @@ class Element(Value):
 			assert self.parent is not None
 			relative = self.parent.get(relative)
 
-		self.properties[name] = ElementProperty(name, value, types, relative=relative)
-		self.computed_properties[name] = ElementProperty(name, value, types, relative=relative)
+		property = None
+
+		# Elements of a class declare the same defaults, so the first
+		# element records them on the class and installs their accessors,
+		# other properties are resolved by __getattr__()
+		if self._declaring:
+			cls = self.__class__
+			defaults = cls.__dict__.get("_defaults")
+			if defaults is None:
+				defaults = cls._defaults = {}
+
+			if name not in defaults:
+				defaults[name] = _create_prototype(name, value, types, relative)
+				setattr(cls, "p_" + name, PropertyAccessor(name))
+
+			prototype = defaults[name]
+			if prototype is not None and relative is None and _is_same_constant(prototype.value, value) \
+					and prototype.types == lookup_types(value.type if types is None else types):
+				property = prototype
+
+		if property is None:
+			property = ElementProperty(name, value, types, relative=relative)
+
+		# The computed property is the declared property itself,
+		# until set_computed() assigns a different value to it
+		self.properties[name] = property
+		self.computed_properties[name] = property
 
 	def get(self, name):
-		return self.properties[name]
+		property = self.properties[name]
+		if property.__class__ is PrototypeProperty:
+			# Copy the shared property, such that it can be
+			# referenced and assigned like any other property
+			prototype = property
+			property = self.properties[name] = ElementProperty(name, prototype.value, prototype.types)
+			if self.computed_properties[name] is prototype:
+				self.computed_properties[name] = property
+		return property
 
 	def set(self, name, value):
 		assert isinstance(name, str)
-		self.get(name).set(value)
-		self.set_computed(name, value)
+		property = self.get(name)
+		property.set(value)
+		if self.get_computed(name) is not property:
+			self.set_computed(name, value)
 
 	def get_computed(self, name):
 		return self.computed_properties[name]
 
 	def set_computed(self, name, value):
 		assert isinstance(name, str)
-		self.get_computed(name).set(value)
+		computed = self.get_computed(name)
+		if computed is self.properties[name]:
+			if computed.value is value:
+				return
+			# Split the computed property from the declared property
+			self.computed_properties[name] = ElementProperty(name, value, computed.types, relative=computed.relative)
+		else:
+			computed.set(value)
 
 	def check_value(self, name, value):
-		self.get(name).check_value(value)
+		self.properties[name].check_value(value)
 		# No need to check computed_properties since they're the same
 
 	# def has(self, name):
@@ -207,8 +563,9 @@ class Element(Value):
 		return self.get_computed(name).eval()
 
 	def __getattr__(self, name):
+		# Only reached for properties without a PropertyAccessor
 		if name.startswith("p_"):
-			return self.eval(name[2:]).unbox()
+			return self.get_computed(name[2:]).eval_unboxed()
 		return self.__getattribute__(name)
 
 	def add(self, element):
@@ -223,10 +580,60 @@ class Element(Value):
 		for child in self.children:
 			yield from child.traverse()
 
-	def compute(self, time):
+	def freeze(self, animated=()):
+		"""Evaluates every property once.
+
+		Expressions only reference declared properties, which don't
+		change while rendering, so their computed values are the same
+		every frame. Only the properties in animated, which animations
+		overwrite, are reassigned by compute(). The computed property
+		of every other property is the memoised declared property.
+		"""
+		frozen = {}
 		for name, property in self.properties.items():
-			self.set_computed(name, property.eval())
-		self.compute_children(time)
+			if name in animated:
+				# The scene derives its frame program from the declared
+				# property, so it mustn't be a shared default
+				property = self.get(name)
+			value = property.eval()
+			if name in animated:
+				# Animations assign the computed property directly,
+				# so it must be split from the declared property
+				computed = self.computed_properties[name]
+				if computed is property:
+					self.computed_properties[name] = ElementProperty(name, value, property.types, relative=property.relative)
+				else:
+					computed.set(value)
+				frozen[name] = value
+			else:
+				self.computed_properties[name] = property
+		self._frozen = frozen
+
+	def compute(self, time):
+		frozen = self._frozen
+
+		if frozen is None:
+			for name, property in self.properties.items():
+				self.set_computed(name, property.eval())
+			self.compute_children(time)
+		elif not frozen:
+			self.compute_children(time)
+		else:
+			# Collect the animated values first, such that each animated
+			# property is only assigned once, and not at all if unchanged
+			samples = self._samples = {}
+			self.compute_children(time)
+			self._samples = None
+
+			for name, value in frozen.items():
+				self.set_computed(name, samples.get(name, value))
+
+	def animate(self, name, value):
+		"""Sets the computed value of an animated property for the current frame."""
+		if self._samples is None:
+			self.set_computed(name, value)
+		else:
+			self._samples[name] = value
 
 	def compute_children(self, time):
 		for child in self.children:
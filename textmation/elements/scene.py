@@ -1,7 +1,13 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from ..datatypes import Number, Time, TimeUnit, Vec4
+from collections import defaultdict
+from operator import itemgetter
+
+from math import inf
+
+from ..datatypes import Number, Time, TimeUnit, Black
+from .element import DerivedValue
 from .drawables import BaseDrawable
 from .animation import Animation
 
@@ -16,10 +22,114 @@ def _duration(scene):
 	return Time(duration, TimeUnit.Seconds)
 
 
+def _animated_properties(scene):
+	animated = defaultdict(set)
+
+	for element in scene.traverse():
+		if isinstance(element, Animation):
+			animated[element.element].update(element.element_properties)
+
+	return animated
+
+
+def _compile_frame_program(scene):
+	"""Lowers the frozen scene into a flat list of steps, one for each
+	element with animated properties, in traversal order.
+
+	All other properties are frozen and animations only read frozen
+	values, so the steps are independent of each other. Each step
+	samples the element's animations in order, such that later ones
+	take precedence, and then assigns the animated properties.
+
+	A step is a tuple of the animations, and a tuple of assignments
+	holding the name, the bound set() of the computed property and
+	the frozen value used when no animation is affecting it.
+	"""
+	program = []
+
+	for element in scene.traverse():
+		if not element._frozen:
+			continue
+
+		animations = tuple(child for child in element.children if isinstance(child, Animation))
+		assignments = tuple((name, element.get_computed(name).set, value) for name, value in element._frozen.items())
+
+		program.append((animations, assignments))
+
+	return program
+
+
+class AnimationIndex:
+	"""Interval index of the windows in which the animations of a frame
+	program are affecting, which take fill_mode and delay into account.
+
+	find() returns the steps of the frame program, which have any
+	animation affecting at a time. Frames are usually computed in order,
+	so the windows are swept through by their lower and upper times,
+	and only swept again from the start if the time goes backwards.
+	"""
+
+	def __init__(self, program):
+		lowers, uppers = [], []
+
+		for step, (animations, _) in enumerate(program):
+			for animation in animations:
+				lower, upper = animation.schedule.window
+				if lower > upper:
+					continue
+				lowers.append((lower, step))
+				uppers.append((upper, step))
+
+		lowers.sort(key=itemgetter(0))
+		uppers.sort(key=itemgetter(0))
+
+		self._lowers = lowers
+		self._uppers = uppers
+		self._reset()
+
+	def _reset(self):
+		self._time = -inf
+		self._lower = 0
+		self._upper = 0
+		# The number of affecting animations of each step
+		self._counts = {}
+
+	def find(self, time):
+		if time < self._time:
+			self._reset()
+		self._time = time
+
+		counts = self._counts
+
+		# Windows are inclusive, and every window which ended
+		# has begun, so begins are handled first
+		lowers, i = self._lowers, self._lower
+		while i < len(lowers) and lowers[i][0] <= time:
+			step = lowers[i][1]
+			counts[step] = counts.get(step, 0) + 1
+			i += 1
+		self._lower = i
+
+		uppers, i = self._uppers, self._upper
+		while i < len(uppers) and uppers[i][0] < time:
+			step = uppers[i][1]
+			if counts[step] == 1:
+				del counts[step]
+			else:
+				counts[step] -= 1
+			i += 1
+		self._upper = i
+
+		return counts.keys()
+
+
 class Scene(BaseDrawable):
 	def __init__(self):
 		super().__init__()
 		self._duration = Time(0, TimeUnit.Seconds)
+		self._program = DerivedValue()
+		self._index = None
+		self._sampled = None
 
 	def on_ready(self):
 		super().on_ready()
@@ -27,7 +137,7 @@ class Scene(BaseDrawable):
 		self.define("width", 100, Number)
 		self.define("height", 100, Number)
 
-		self.define("background", Vec4(0, 0, 0, 255))
+		self.define("background", Black)
 
 		self.define("frame_rate", 20, Number)
 
@@ -40,3 +150,67 @@ class Scene(BaseDrawable):
 		# Only calculate duration if it wasn't manually set
 		if self._duration is self.get("duration").get():
 			self.set("duration", _duration(self))
+
+	def freeze_all(self):
+		"""Evaluates all static properties of the scene once, and compiles
+		the frame program, which compute() runs to update the animated
+		properties every frame."""
+		animated = _animated_properties(self)
+
+		# The frozen values are only derived from the declared animated
+		# properties, and the windows of the index from the schedules
+		inputs = []
+
+		for element in self.traverse():
+			element.freeze(animated.get(element, ()))
+			inputs.extend(map(element.properties.__getitem__, element._frozen))
+			if isinstance(element, Animation):
+				element.schedule
+				inputs.append(element._schedule)
+
+		program = _compile_frame_program(self)
+		self._index = AnimationIndex(program)
+		self._program.set(program, inputs)
+		# Freezing assigns the frozen values to every animated property
+		self._sampled = set()
+
+	def frame_program(self):
+		# Changing any of the inputs discards the frozen values
+		program = self._program.get()
+		if program is None:
+			self.freeze_all()
+			program = self._program.get()
+
+		return program
+
+	def invalidate_samples(self):
+		"""Marks the animated properties as assigned outside of compute(),
+		such that the next compute() resets all of them, which no
+		animation is affecting."""
+		self._sampled = None
+
+	def compute(self, time):
+		program = self.frame_program()
+		steps = self._index.find(time)
+
+		# Steps without affecting animations aren't sampled, so only the
+		# ones sampled by the last frame have to be reset to frozen values
+		if self._sampled is None:
+			reset = (step for step in range(len(program)) if step not in steps)
+		else:
+			reset = self._sampled.difference(steps)
+
+		for step in reset:
+			for name, assign, value in program[step][1]:
+				assign(value)
+
+		for step in steps:
+			animations, assignments = program[step]
+			samples = {}
+			animate = samples.__setitem__
+			for animation in animations:
+				animation.sample(time, animate)
+			for name, assign, value in assignments:
+				assign(samples.get(name, value))
+
+		self._sampled = set(steps)
@@ -26,7 +26,18 @@ def type_check_function_call(f, args):
 			raise TypeError(f"{name} expected parameter {i} as {param_type.name}, received {arg.type.name}")
 
 
-def function(*args):
+def check_function_result(f, result):
+	name, return_type = f.name, f.return_type
+
+	if not isinstance(result, Value):
+		raise FunctionError(f"Expected {return_type.name} from {name}, received {type(result)}")
+	if result.type is not return_type:
+		raise FunctionError(f"Expected {return_type.name} from {name}, received {result.type.name}")
+
+	return result
+
+
+def function(*args, pure=True):
 	name, parameter_types, return_type = None, (), None
 
 	assert 1 <= len(args) <= 3
@@ -57,19 +68,15 @@ def function(*args):
 		def wrapper(*args):
 			type_check_function_call(wrapper, args)
 
-			result = f(*args)
-
-			if not isinstance(result, Value):
-				raise FunctionError(f"Expected {return_type.name} from {name}, received {type(result)}")
-			if result.type is not return_type:
-				raise FunctionError(f"Expected {return_type.name} from {name}, received {result.type.name}")
-
-			return result
+			return check_function_result(wrapper, f(*args))
 
 		wrapper.name = name
 		wrapper.parameter_types = parameter_types
 		wrapper.return_type = return_type
+		# Pure functions with constant arguments are evaluated before building the scene
+		wrapper.pure = pure
 		wrapper.type_check = lambda args: type_check_function_call(wrapper, args)
+		wrapper.check_result = lambda result: check_function_result(wrapper, result)
 
 		functions[name] = wrapper
 
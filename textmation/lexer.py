@@ -1,11 +1,15 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from itertools import zip_longest
+from itertools import zip_longest, islice
 from contextlib import suppress
 import string
 from enum import IntEnum
 from ast import literal_eval
+from bisect import bisect_right
+import re
+
+from .utilities import gc_paused
 
 
 _horizontal_whitespace = " \t"
@@ -13,6 +17,21 @@ _horizontal_whitespace = " \t"
 _identifier_start = string.ascii_letters + "_$"
 _identifier = _identifier_start + string.digits
 
+# Used by FastLexer, every character outside of strings and comments must
+# be matched, otherwise FastLexer falls back to Lexer
+_token_pattern = re.compile(r"""
+	([ \t]*)
+	(?:
+		  ([A-Za-z_$][A-Za-z0-9_$]*)                                    # Identifier
+		| (\r?\n)                                                      # Newline
+		| (:=|[!%&()*+,\-./:;<=>?@\[\\\]^`{|}~])                          # Symbol
+		| ([0-9]+(?:\.[0-9]*)?(?:%|[A-Za-z0-9_$]*))                      # Number
+		| ("(?:[^"\\\n]|\\[\s\S])*"|'(?:[^'\\\n]|\\[\s\S])*')  # String
+		| (\#[^\r\n]*)                                                 # Comment
+		| ([\s\S])                                                      # Anything else
+	)
+""", re.VERBOSE)
+
 
 class TokenType(IntEnum):
 	EndOfStream = 1
@@ -27,22 +46,136 @@ class TokenType(IntEnum):
 	Symbol      = 9
 
 
+class LineEdits:
+	"""The edits made to a string since a LineTable was superseded.
+
+	Every superseded table shares the list, and applies the edits made
+	since it was superseded to move its offsets into lines, the table
+	of the latest string.
+	"""
+
+	__slots__ = "edits", "lines"
+
+	def __init__(self):
+		self.edits = []
+		self.lines = None
+
+
+class LineTable:
+	"""Resolves string offsets into 1-based (line, character) positions.
+
+	The line start offsets are only collected the first time a position
+	is needed, e.g. for an error message.
+	"""
+
+	__slots__ = "string", "_starts", "_edits", "_index"
+
+	def __init__(self, string):
+		self.string = string
+		self._starts = None
+		# The edits shared with the superseded tables, and the
+		# first one made after this table was superseded
+		self._edits = None
+		self._index = None
+
+	def move(self, end, delta, lines):
+		"""Resolve positions using lines from now on, after the string was edited.
+
+		Offsets at or after end are moved by delta, this allows
+		reusing tokens after an edit without updating all of them.
+		"""
+		assert self._index is None
+
+		edits = self._edits
+		if edits is None:
+			edits = self._edits = LineEdits()
+
+		self._index = len(edits.edits)
+		edits.edits.append((end, delta))
+		edits.lines = lines
+		lines._edits = edits
+
+		# Only lines resolves positions from now on
+		self.string = None
+		self._starts = None
+
+	@property
+	def superseded(self):
+		return self._index is not None
+
+	def resolve(self, begin, end):
+		"""Returns the latest table, and begin and end moved into its string."""
+		if self._index is None:
+			return self, begin, end
+
+		# Every superseded table shares the edits, so positions
+		# are resolved with a single table, the latest one
+		edits = self._edits
+		for edit_end, delta in islice(edits.edits, self._index, None):
+			if begin >= edit_end:
+				begin += delta
+			if end >= edit_end:
+				end += delta
+
+		return edits.lines, begin, end
+
+	def position(self, offset):
+		lines, offset, _ = self.resolve(offset, offset)
+
+		starts = lines._starts
+		if starts is None:
+			starts = [0]
+			starts.extend(m.end() for m in re.finditer("\n", lines.string))
+			lines._starts = starts
+
+		line = bisect_right(starts, offset)
+		return line, offset - starts[line - 1] + 1
+
+	def span(self, begin, end):
+		return self.position(begin), self.position(end)
+
+
 class Token:
-	def __init__(self, type, value, span=None):
+	"""A token spanning the offsets begin to end of lines.string.
+
+	Tokens can also be created from an explicit ((line, character),
+	(line, character)) span, in which case lines is None.
+	"""
+
+	__slots__ = "type", "value", "begin", "end", "lines"
+
+	def __init__(self, type, value, begin=None, end=None, lines=None):
 		self.type = type
 		self.value = value
-		self.span = span
+		if lines is None and end is None and begin is not None:
+			begin, end = begin
+		self.begin = begin
+		self.end = end
+		self.lines = lines
+
+	@property
+	def span(self):
+		if self.lines is not None:
+			if self.lines.superseded:
+				# Only move the offsets by the edits made since last time
+				self.lines, self.begin, self.end = self.lines.resolve(self.begin, self.end)
+			return self.lines.span(self.begin, self.end)
+		if self.begin is None:
+			return None
+		return self.begin, self.end
 
 	def __str__(self):
-		if self.span is not None:
-			begin, end = self.span
+		span = self.span
+		if span is not None:
+			begin, end = span
 			return "<%s: %s, %r (%d:%d, %d:%d)>" % (self.__class__.__name__, self.type.name, self.value, *begin, *end)
 		else:
 			return "<%s: %s, %r>" % (self.__class__.__name__, self.type.name, self.value)
 
 	def __repr__(self):
-		if self.span is not None:
-			return "%s(%r, %r, %r)" % (self.__class__.__name__, self.type, self.value, self.span)
+		span = self.span
+		if span is not None:
+			return "%s(%r, %r, %r)" % (self.__class__.__name__, self.type, self.value, span)
 		else:
 			return "%s(%r, %r)" % (self.__class__.__name__, self.type, self.value)
 
@@ -59,14 +192,12 @@ class LexerState:
 	def __init__(self, lexer):
 		self.lexer = lexer
 		self.ptr = lexer.ptr
-		self.line, self.character = lexer.line, lexer.character
 		self.indents = lexer.indents[:]
 		self.dedents = lexer.dedents
 		self.brackets = lexer.brackets[:]
 
 	def _apply(self):
 		self.lexer.ptr = self.ptr
-		self.lexer.line, self.lexer.character = self.line, self.character
 		self.lexer.indents = self.indents
 		self.lexer.dedents = self.dedents
 		self.lexer.brackets = self.brackets
@@ -89,24 +220,24 @@ class LexerPeeking:
 
 
 class Lexer:
-	def __init__(self, string):
+	def __init__(self, string, begin=0, end=None):
 		self.string = string
-		self.length = len(string)
-		self.ptr = 0
-		self.line, self.character = 1, 1
+		self.length = len(string) if end is None else end
+		self.lines = LineTable(string)
+		self.ptr = begin
 		self.indents = [""]
 		self.dedents = 0
 		self.brackets = []
 
-	def _fail(self, message, span):
-		begin, end = span
+	def _fail(self, message, begin, end):
+		begin, end = self.lines.span(begin, end)
 		raise LexerError("%s (%d:%d, %d:%d)" % (message, *begin, *end))
 
-	def _unexpected(self, unexpected, expected=None, span=None):
+	def _unexpected(self, unexpected, expected=None, begin=None, end=None):
 		if expected is not None:
-			self._fail("Unexpected %r, expected %r" % (unexpected, expected), span)
+			self._fail("Unexpected %r, expected %r" % (unexpected, expected), begin, end)
 		else:
-			self._fail("Unexpected %r" % unexpected, span)
+			self._fail("Unexpected %r" % unexpected, begin, end)
 
 	def _next(self):
 		if self.ptr >= self.length:
@@ -115,12 +246,6 @@ class Lexer:
 		c = self.string[self.ptr]
 		self.ptr += 1
 
-		if c == "\n":
-			self.line += 1
-			self.character = 1
-		else:
-			self.character += 1
-
 		return c
 
 	def _peek(self, offset=0):
@@ -131,33 +256,30 @@ class Lexer:
 
 	def next(self):
 		if self.dedents > 0:
-			span_end = self.line, self.character
-
 			self.indents.pop()
 			self.dedents -= 1
 
-			return Token(TokenType.Dedent, self.indents[-1], (span_end, span_end))
+			return Token(TokenType.Dedent, self.indents[-1], self.ptr, self.ptr, self.lines)
 
 		if self.ptr >= self.length:
-			span_end = self.line, self.character
-
 			if len(self.brackets) > 0:
-				self._fail("Unexpected end, expected %r" % self.brackets[-1], (span_end, span_end))
+				self._fail("Unexpected end, expected %r" % self.brackets[-1], self.ptr, self.ptr)
 
 			if len(self.indents) > 1:
 				self.indents.pop()
-				return Token(TokenType.Dedent, self.indents[-1], (span_end, span_end))
+				return Token(TokenType.Dedent, self.indents[-1], self.ptr, self.ptr, self.lines)
 
-			return Token(TokenType.EndOfStream, "", (span_end, span_end))
+			return Token(TokenType.EndOfStream, "", self.ptr, self.ptr, self.lines)
 
 		c = self.string[self.ptr]
 
-		if self.character == 1 and len(self.brackets) == 0:
+		at_line_begin = self.ptr == 0 or self.string[self.ptr - 1] == "\n"
+
+		if at_line_begin and len(self.brackets) == 0:
 			with self.peeking() as p:
 				empty_line = False
 
 				while self.ptr < self.length:
-					span_begin = self.line, self.character
 					begin = self.ptr
 					c2 = self._next()
 					if not c2.isspace():
@@ -170,26 +292,24 @@ class Lexer:
 						break
 				else:
 					p.save()
-					return self.next()
 
 				if empty_line:
 					p.save()
-					span_end = self.line, self.character
-					return Token(TokenType.Newline, self.string[begin:self.ptr], (span_begin, span_end))
+					return Token(TokenType.Newline, self.string[begin:self.ptr], begin, self.ptr, self.lines)
+
+			if self.ptr >= self.length:
+				return self.next()
 
 			if c not in _horizontal_whitespace:
 				if len(self.indents) > 1:
 					self.indents.pop()
-					span_end = self.line, self.character
-					return Token(TokenType.Dedent, self.indents[-1], (span_end, span_end))
+					return Token(TokenType.Dedent, self.indents[-1], self.ptr, self.ptr, self.lines)
 			else:
-				span_begin = self.line, self.character
 				begin = self.ptr
 				while self.ptr < self.length:
 					if self.string[self.ptr] not in _horizontal_whitespace:
 						break
 					self._next()
-				span_end = self.line, self.character
 
 				if self.string[self.ptr] != "#":
 					old_indent = self.indents[-1]
@@ -198,7 +318,7 @@ class Lexer:
 					for old, new in zip_longest(old_indent, new_indent):
 						if old is None:
 							self.indents.append(new_indent)
-							return Token(TokenType.Indent, new_indent, (span_begin, span_end))
+							return Token(TokenType.Indent, new_indent, begin, self.ptr, self.lines)
 
 						if new is None:
 							for i in range(len(self.indents) - 1, 0, -1):
@@ -206,35 +326,34 @@ class Lexer:
 									break
 								self.dedents += 1
 							else:
-								self._fail("Dedent does not match any outer indentation level", (span_begin, span_end))
+								self._fail("Dedent does not match any outer indentation level", begin, self.ptr)
 
 							self.indents.pop()
 							self.dedents -= 1
 
-							return Token(TokenType.Dedent, self.indents[-1], (span_end, span_end))
+							return Token(TokenType.Dedent, self.indents[-1], self.ptr, self.ptr, self.lines)
 
 						if old != new:
-							self._fail("Inconsistent use of tabs and spaces in indentation", (span_begin, span_end))
+							self._fail("Inconsistent use of tabs and spaces in indentation", begin, self.ptr)
 
 		while self.ptr < self.length:
 			if self.string[self.ptr] not in _horizontal_whitespace:
 				break
 			self._next()
+		else:
+			return self.next()
 
 		c = self.string[self.ptr]
 
 		if c == "#":
-			span_begin = self.line, self.character
 			begin = self.ptr
 			while self.ptr < self.length:
 				if self.string[self.ptr] in "\r\n":
 					break
 				self._next()
-			span_end = self.line, self.character
-			return Token(TokenType.Comment, self.string[begin:self.ptr], (span_begin, span_end))
+			return Token(TokenType.Comment, self.string[begin:self.ptr], begin, self.ptr, self.lines)
 
 		if c.isdigit():
-			span_begin = self.line, self.character
 			begin = self.ptr
 
 			while self.ptr < self.length:
@@ -258,23 +377,18 @@ class Lexer:
 							break
 						self._next()
 
-			span_end = self.line, self.character
-
-			return Token(TokenType.Number, self.string[begin:self.ptr], (span_begin, span_end))
-			# return Token(TokenType.Integer, self.string[begin:self.ptr], (span_begin, span_end))
+			return Token(TokenType.Number, self.string[begin:self.ptr], begin, self.ptr, self.lines)
+			# return Token(TokenType.Integer, self.string[begin:self.ptr], begin, self.ptr, self.lines)
 
 		if c in _identifier_start:
-			span_begin = self.line, self.character
 			begin = self.ptr
 			while self.ptr < self.length:
 				if self.string[self.ptr] not in _identifier:
 					break
 				self._next()
-			span_end = self.line, self.character
-			return Token(TokenType.Identifier, self.string[begin:self.ptr], (span_begin, span_end))
+			return Token(TokenType.Identifier, self.string[begin:self.ptr], begin, self.ptr, self.lines)
 
 		if c in "\"'":
-			span_begin = self.line, self.character
 			begin = self.ptr
 			quote = self._next()
 			while True:
@@ -285,32 +399,29 @@ class Lexer:
 				if c == quote:
 					break
 				if c == "\n":
-					self._fail("Unexpected end of line while scanning string literal", (span_begin, (self.line, self.character)))
-			span_end = self.line, self.character
-			# return Token(TokenType.String, self.string[begin:self.ptr], (span_begin, span_end))
-			return Token(TokenType.String, literal_eval(self.string[begin:self.ptr]), (span_begin, span_end))
+					self._fail("Unexpected end of line while scanning string literal", begin, self.ptr)
+			# return Token(TokenType.String, self.string[begin:self.ptr], begin, self.ptr, self.lines)
+			return Token(TokenType.String, literal_eval(self.string[begin:self.ptr]), begin, self.ptr, self.lines)
 
 		if self.string[self.ptr] in "\r\n":
-			span_begin = self.line, self.character
 			begin = self.ptr
 			if self._next() == "\r":
 				assert self._next() == "\n"
-			span_end = self.line, self.character
-			return Token(TokenType.Newline, self.string[begin:self.ptr], (span_begin, span_end))
+			return Token(TokenType.Newline, self.string[begin:self.ptr], begin, self.ptr, self.lines)
 
 		assert not c.isspace()
 
-		span_begin = self.line, self.character
+		begin = self.ptr
 		c = self._next()
-		span_end = self.line, self.character
+		end = self.ptr
 
 		if c in "([{":
 			self.brackets.append(")]}"["([{".index(c)])
 		elif c in ")]}":
 			if len(self.brackets) == 0:
-				self._unexpected(c, span=(span_begin, span_end))
+				self._unexpected(c, begin=begin, end=end)
 			if self.brackets[-1] != c:
-				self._unexpected(c, self.brackets[-1], (span_begin, span_end))
+				self._unexpected(c, self.brackets[-1], begin, end)
 			self.brackets.pop()
 
 		symbol = c
@@ -320,10 +431,10 @@ class Lexer:
 				with self.peeking() as p:
 					if self._peek() == "=":
 						symbol += self._next()
-						span_end = self.line, self.character
+						end = self.ptr
 						p.save()
 
-		return Token(TokenType.Symbol, symbol, (span_begin, span_end))
+		return Token(TokenType.Symbol, symbol, begin, end, self.lines)
 
 	def peek(self, offset=0):
 		with self.peeking():
@@ -347,3 +458,139 @@ class Lexer:
 			yield token
 			if token.type == TokenType.EndOfStream:
 				break
+
+
+class FastLexerState:
+	def __init__(self, lexer):
+		self.lexer = lexer
+		self.index = lexer.index
+
+	def _apply(self):
+		self.lexer.index = self.index
+
+
+class FastLexer(Lexer):
+	"""Produces the same token stream as Lexer, but in a single pass.
+
+	Instead of walking the input one character at a time, the whole input
+	is split using a compiled master regex, and indentation is resolved
+	from the leading whitespace of the first token on each line. Peeking
+	and restoring state is then only an index change.
+
+	Input which the master regex does not fully cover (e.g. unterminated
+	strings or unexpected whitespace) or which results in an error, is
+	handed to Lexer, such that errors are reported exactly as Lexer does.
+	"""
+
+	def __init__(self, string, begin=0, end=None):
+		super().__init__(string, begin, end)
+		self.index = 0
+
+		with gc_paused():
+			self._tokens = self._tokenize()
+
+	def next(self):
+		tokens = self._tokens
+		if tokens is None:
+			return super().next()
+
+		index = self.index
+		token = tokens[index]
+		if token.type != TokenType.EndOfStream:
+			self.index = index + 1
+		return token
+
+	def get_state(self):
+		if self._tokens is None:
+			return super().get_state()
+		return FastLexerState(self)
+
+	def _tokenize(self):
+		string = self.string
+		lines = self.lines
+		indents = [""]
+		brackets = []
+
+		tokens = []
+		append = tokens.append
+
+		Identifier, Newline, Symbol, Number, String, Comment = \
+			TokenType.Identifier, TokenType.Newline, TokenType.Symbol, \
+			TokenType.Number, TokenType.String, TokenType.Comment
+
+		ptr = self.ptr
+		at_line_begin = ptr == 0 or string[ptr - 1] == "\n"
+
+		for whitespace, identifier, newline, symbol, number, string_literal, comment, unexpected in _token_pattern.findall(string, ptr, self.length):
+			if unexpected:
+				return None
+
+			begin = ptr + len(whitespace)
+
+			if at_line_begin:
+				at_line_begin = False
+
+				if len(brackets) == 0 and not newline:
+					if not whitespace:
+						while len(indents) > 1:
+							indents.pop()
+							append(Token(TokenType.Dedent, indents[-1], begin, begin, lines))
+					elif not comment and whitespace != indents[-1]:
+						old_indent = indents[-1]
+
+						if whitespace.startswith(old_indent):
+							indents.append(whitespace)
+							append(Token(TokenType.Indent, whitespace, ptr, begin, lines))
+						elif old_indent.startswith(whitespace) and whitespace in indents:
+							while indents[-1] != whitespace:
+								indents.pop()
+								append(Token(TokenType.Dedent, indents[-1], begin, begin, lines))
+						else:
+							return None
+
+			if identifier:
+				ptr = begin + len(identifier)
+				append(Token(Identifier, identifier, begin, ptr, lines))
+			elif newline:
+				ptr = begin + len(newline)
+				append(Token(Newline, newline, begin, ptr, lines))
+				at_line_begin = True
+			elif symbol:
+				ptr = begin + len(symbol)
+				if symbol in "([{":
+					brackets.append(")]}"["([{".index(symbol)])
+				elif symbol in ")]}":
+					if len(brackets) == 0 or brackets[-1] != symbol:
+						return None
+					brackets.pop()
+				append(Token(Symbol, symbol, begin, ptr, lines))
+			elif number:
+				ptr = begin + len(number)
+				append(Token(Number, number, begin, ptr, lines))
+			elif string_literal:
+				ptr = begin + len(string_literal)
+				if "\\" in string_literal or "\r" in string_literal:
+					try:
+						value = literal_eval(string_literal)
+					except Exception:
+						return None
+				else:
+					value = string_literal[1:-1]
+				append(Token(String, value, begin, ptr, lines))
+			else:
+				ptr = begin + len(comment)
+				append(Token(Comment, comment, begin, ptr, lines))
+
+		# Only trailing whitespace remains
+		if len(brackets) > 0:
+			return None
+
+		ptr = self.length
+
+		while len(indents) > 1:
+			indents.pop()
+			append(Token(TokenType.Dedent, indents[-1], ptr, ptr, lines))
+
+		append(Token(TokenType.EndOfStream, "", ptr, ptr, lines))
+
+		return tokens
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from copy import copy
+
+from .parser import Node, Number
+from .datatypes import Value, Number as NumberValue, String as StringValue, intern_number, \
+	Angle, AngleUnit, Time, TimeUnit, \
+	BinOp as BinOpValue, UnaryOp as UnaryOpValue, Call as CallValue
+from .functions import functions
+
+
+_angle_units = dict((unit.value, unit) for unit in AngleUnit)
+_time_units = dict((unit.value, unit) for unit in TimeUnit)
+
+
+class Constant(Node):
+	"""An already evaluated constant subtree."""
+
+	def __init__(self, value, *, token=None):
+		super().__init__(token=token)
+		assert isinstance(value, Value)
+		self.value = value
+
+	def __repr__(self):
+		return f"<{self.__class__.__name__}: {self.value!r}>"
+
+
+class ConstantFolder:
+	"""Replaces constant subtrees of a parser tree with Constant nodes.
+
+	Constant subtrees are evaluated using the same datatypes the scene
+	evaluates every frame, so folding never changes a result. Subtrees
+	which fail to evaluate are kept as is, such that SceneBuilder
+	reports the error as usual. Percentages depend on the property
+	they are assigned to, so they are never folded into a Constant.
+
+	The given tree is not modified, changed nodes are copied.
+	"""
+
+	def fold(self, node):
+		assert isinstance(node, Node)
+		method = "_fold_%s" % node.__class__.__name__
+		visitor = getattr(self, method, self._fold_children)
+		return visitor(node)
+
+	def _fold_children(self, node):
+		children = [self.fold(child) for child in node.children]
+		if all(new is old for new, old in zip(children, node.children)):
+			return node
+		node = copy(node)
+		node.children = children
+		return node
+
+	@staticmethod
+	def _try_eval(expression, *args, token=None):
+		try:
+			value = expression(*args).eval()
+		except Exception:
+			return None
+		if type(value) is NumberValue:
+			value = intern_number(value.value)
+		return Constant(value, token=token)
+
+	def _fold_Constant(self, constant):
+		return constant
+
+	def _fold_Number(self, number):
+		value, unit = number.value, number.unit
+
+		if unit is None:
+			return Constant(intern_number(value), token=number.token)
+		elif unit in _angle_units:
+			return Constant(Angle(value, _angle_units[unit]), token=number.token)
+		elif unit in _time_units:
+			return Constant(Time(value, _time_units[unit]), token=number.token)
+
+		return number
+
+	def _fold_String(self, string):
+		return Constant(StringValue(string.string), token=string.token)
+
+	def _fold_UnaryOp(self, unary_op):
+		unary_op = self._fold_children(unary_op)
+		operand = unary_op.operand
+
+		if isinstance(operand, Constant):
+			return self._try_eval(UnaryOpValue, unary_op.op, operand.value, token=unary_op.token) or unary_op
+
+		# -100% is the same as a -100 percentage
+		if isinstance(operand, Number) and operand.unit == "%" and unary_op.op == "-":
+			number = copy(operand)
+			number.value = -number.value
+			return number
+
+		return unary_op
+
+	def _fold_BinOp(self, bin_op):
+		bin_op = self._fold_children(bin_op)
+		lhs, rhs = bin_op.lhs, bin_op.rhs
+
+		if isinstance(lhs, Constant) and isinstance(rhs, Constant):
+			return self._try_eval(BinOpValue, bin_op.op, lhs.value, rhs.value, token=bin_op.token) or bin_op
+
+		return bin_op
+
+	def _fold_Call(self, call):
+		call = self._fold_children(call)
+
+		func = functions.get(call.name)
+		if func is None or not func.pure:
+			return call
+
+		if all(isinstance(arg, Constant) for arg in call.args):
+			args = tuple(arg.value for arg in call.args)
+			return self._try_eval(CallValue, func, args, token=call.token) or call
+
+		return call
+
+	def _fold_Name(self, name):
+		return name
+
+	def _fold_MemberAccess(self, member_access):
+		return member_access
+
+
+def fold_constants(node):
+	return ConstantFolder().fold(node)
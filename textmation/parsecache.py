@@ -0,0 +1,226 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from hashlib import sha256
+import marshal
+import os
+from os.path import expanduser, join
+import tempfile
+
+from . import lexer as _lexer_module, parser as _parser_module
+from .lexer import Lexer, LineTable, Token, TokenType
+from .parser import parse, iter_parse, Node, Create
+from .utilities import iter_all_subclasses, gc_paused
+
+
+_extension = ".ast"
+
+_node_types = dict((cls.__name__, cls) for cls in (Node, *iter_all_subclasses(Node)))
+_token_types = dict((type.value, type) for type in TokenType)
+
+
+def _default_directory():
+	directory = os.environ.get("TEXTMATION_CACHE_DIR")
+	if directory:
+		return directory
+	cache_home = os.environ.get("XDG_CACHE_HOME") or expanduser(join("~", ".cache"))
+	return join(cache_home, "textmation", "parse")
+
+
+def _parser_version():
+	# Any change to the lexer or parser invalidates all cached trees
+	version = sha256(marshal.dumps(marshal.version))
+	for module in (_lexer_module, _parser_module):
+		with open(module.__file__, "rb") as f:
+			version.update(f.read())
+	return version.digest()
+
+
+def _encode(node):
+	attributes = dict(node.__dict__)
+	del attributes["children"]
+	del attributes["token"]
+
+	token = node.token
+	if token is not None:
+		begin, end = token.begin, token.end
+		if token.lines is not None:
+			# Tokens reused by reparse() refer to an older string
+			_, begin, end = token.lines.resolve(begin, end)
+		token = token.type.value, token.value, begin, end
+
+	return node.__class__.__name__, attributes, token, tuple(map(_encode, node.children))
+
+
+def _decode(data, lines):
+	name, attributes, token, children = data
+
+	cls = _node_types[name]
+	node = cls.__new__(cls)
+	node.__dict__.update(attributes)
+
+	if token is not None:
+		token_type, value, begin, end = token
+		token = Token(_token_types[token_type], value, begin, end, lines)
+	node.token = token
+
+	node.children = [_decode(child, lines) for child in children]
+
+	return node
+
+
+def dumps(scene):
+	"""Serialize a scene returned by parse() into bytes."""
+	data = _encode(scene)
+	# The source is the cache key, so there is no need to store it
+	attributes = data[1]
+	del attributes["string"]
+	del attributes["lines"]
+	return marshal.dumps(data)
+
+
+def loads(data, string):
+	"""Deserialize a scene serialized by dumps() from the source string."""
+	lines = LineTable(string)
+	with gc_paused():
+		scene = _decode(marshal.loads(data), lines)
+	scene.string = string
+	scene.lines = lines
+	return scene
+
+
+class ParseCache:
+	"""Persistent cache of parsed scenes keyed by a hash of their source.
+
+	When the cache exceeds max_size bytes or max_entries files, the
+	least recently used entries are removed.
+	"""
+
+	def __init__(self, directory=None, *, max_size=64 * 1024 * 1024, max_entries=256, lexer=Lexer):
+		self.directory = directory if directory is not None else _default_directory()
+		self.max_size = max_size
+		self.max_entries = max_entries
+		self.lexer = lexer
+		self._version = None
+
+	def _path(self, string):
+		if self._version is None:
+			self._version = _parser_version()
+		key = sha256(self._version)
+		key.update(string.encode("utf-8", "surrogatepass"))
+		return join(self.directory, key.hexdigest() + _extension)
+
+	def _load(self, path, string):
+		try:
+			with open(path, "rb") as f:
+				data = f.read()
+		except OSError:
+			return None
+
+		try:
+			scene = loads(data, string)
+		except Exception:
+			# Truncated or otherwise corrupted entry
+			self._remove(path)
+			return None
+
+		# The modification time is used as the last access time
+		try:
+			os.utime(path)
+		except OSError:
+			pass
+
+		return scene
+
+	def parse(self, string):
+		path = self._path(string)
+
+		scene = self._load(path, string)
+		if scene is not None:
+			return scene
+
+		scene = parse(string, lexer=self.lexer)
+		self._store(path, dumps(scene))
+		return scene
+
+	def iter_parse(self, string):
+		"""Like iter_parse(), but the top-level nodes are read from the
+		cache if possible.
+
+		On a miss, each node is yielded as soon as it is parsed, and the
+		scene is stored once all of them have been parsed.
+		"""
+		path = self._path(string)
+
+		scene = self._load(path, string)
+		if scene is not None:
+			yield from scene.children
+			return
+
+		scene = Create("Scene")
+		offsets = []
+
+		for node in iter_parse(string, lexer=self.lexer, offsets=offsets):
+			scene.add(node)
+			yield node
+
+		scene.string = string
+		scene.lines = LineTable(string)
+		scene.offsets = offsets
+
+		self._store(path, dumps(scene))
+
+	def _store(self, path, data):
+		try:
+			os.makedirs(self.directory, exist_ok=True)
+
+			# Write to a temporary file first, such that concurrent
+			# runs never read a partially written entry
+			fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+			try:
+				with os.fdopen(fd, "wb") as f:
+					f.write(data)
+				os.replace(temp_path, path)
+			except BaseException:
+				self._remove(temp_path)
+				raise
+		except OSError:
+			return
+
+		self.evict()
+
+	def evict(self):
+		entries = []
+		try:
+			with os.scandir(self.directory) as it:
+				for entry in it:
+					if entry.name.endswith(_extension):
+						try:
+							stat = entry.stat()
+						except OSError:
+							continue
+						entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+		except OSError:
+			return
+
+		entries.sort(reverse=True)
+
+		size = 0
+		for i, (_, entry_size, path) in enumerate(entries):
+			size += entry_size
+			if i >= self.max_entries or size > self.max_size:
+				self._remove(path)
+
+	def clear(self):
+		max_entries, self.max_entries = self.max_entries, 0
+		try:
+			self.evict()
+		finally:
+			self.max_entries = max_entries
+
+	@staticmethod
+	def _remove(path):
+		try:
+			os.remove(path)
+		except OSError:
+			pass
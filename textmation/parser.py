@@ -1,6 +1,8 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+from bisect import bisect_left, bisect_right
+from collections import deque
 from contextlib import contextmanager
 import math
 import re
@@ -190,20 +192,30 @@ class ParserError(Exception):
 
 
 class Parser:
-	def __init__(self):
+	def __init__(self, *, lexer=Lexer):
+		self._lexer_type = lexer
 		self._lexer = None
-
-	def _next(self):
-		for token in self._lexer:
+		# Lookahead buffer of already lexed (non-comment) tokens,
+		# such that every token is only lexed once
+		self._tokens = deque()
+
+	def _fill(self, count):
+		tokens = self._tokens
+		while len(tokens) < count:
+			token = self._lexer.next()
 			if token.type == TokenType.Comment:
 				continue
-			return token
+			tokens.append(token)
+
+	def _next(self):
+		if not self._tokens:
+			self._fill(1)
+		return self._tokens.popleft()
 
 	def _peek(self, offset=0):
-		with self._lexer.peeking():
-			for _ in range(offset):
-				self._next()
-			return self._next()
+		if len(self._tokens) <= offset:
+			self._fill(offset + 1)
+		return self._tokens[offset]
 
 	def _peek_if(self, type, value=None, offset=0):
 		token = self._peek(offset)
@@ -226,11 +238,8 @@ class Parser:
 		return result
 
 	def _skip(self, *types):
-		with self._lexer.peeking() as p:
-			for token in self._lexer:
-				if token.type not in types:
-					break
-				p.save()
+		while self._peek().type in types:
+			self._tokens.popleft()
 
 	def _skip_newlines(self):
 		self._skip(TokenType.Newline, TokenType.Comment)
@@ -291,21 +300,109 @@ class Parser:
 		self._expect_token(TokenType.Dedent)
 
 	def parse(self, string):
-		self._lexer = Lexer(string)
+		offsets = []
+		body, lines = self._parse_scene(string, 0, len(string), offsets)
+
+		scene = Create("Scene")
+		scene.extend(body)
+
+		# Kept for reparse(), offsets[i] is where the top-level
+		# scene.children[i] begins in string
+		scene.string = string
+		scene.lines = lines
+		scene.offsets = offsets
+
+		return scene
+
+	def reparse(self, scene, begin, end, text):
+		"""Update scene (returned by parse()) after replacing scene.string[begin:end] with text.
+
+		Only the top-level blocks touched by the edit are lexed and parsed
+		again, every other top-level node is reused. The scene is updated
+		in-place and returned.
+		"""
+
+		string = scene.string
+		offsets = scene.offsets
+
+		new_string = string[:begin] + text + string[end:]
+		delta = len(text) - (end - begin)
+
+		if len(offsets) == 0:
+			return self._reparse_all(scene, new_string)
+
+		# Top-level block i spans starts[i] to starts[i + 1], an edit
+		# touching the beginning of a block can also affect the previous
+		# one, e.g. inserting indentation
+		starts = [0, *offsets[1:]]
+		first = max(bisect_left(starts, begin) - 1, 0)
+		last = bisect_right(starts, end) - 1
+
+		block_begin = starts[first]
+		block_end = starts[last + 1] if last + 1 < len(starts) else len(string)
+
+		new_offsets = []
+		try:
+			body, lines = self._parse_scene(new_string, block_begin, block_end + delta, new_offsets)
+		except Exception:
+			# The edit might have changed how the following blocks are
+			# parsed, e.g. by leaving a bracket open. Parsing everything
+			# either succeeds or raises the actual error.
+			return self._reparse_all(scene, new_string)
+
+		# Tokens of the reused nodes still refer to the old string
+		scene.lines.move(end, delta, lines)
+
+		scene.children[first:last + 1] = body
+		scene.string = new_string
+		scene.lines = lines
+		scene.offsets = offsets[:first] + new_offsets + [offset + delta for offset in offsets[last + 1:]]
+
+		return scene
+
+	def _reparse_all(self, scene, string):
+		new_scene = self.parse(string)
+		scene.children = new_scene.children
+		scene.string = new_scene.string
+		scene.lines = new_scene.lines
+		scene.offsets = new_scene.offsets
+		return scene
+
+	def iter_parse(self, string, offsets=None):
+		"""Parse string, yielding each top-level node as soon as it is parsed.
+
+		Only the lookahead tokens are buffered, i.e. with Lexer, a node
+		is yielded as soon as its indentation block is closed. If offsets
+		is given, where each node begins is appended to it, like parse()
+		records in scene.offsets.
+		"""
+
+		self._lexer = self._lexer_type(string)
+		self._tokens.clear()
 
-		scene = self._parse_scene()
+		yield from self._iter_body_elements(allow_template=True, offsets=offsets)
 
 		self._skip_newlines()
 		self._expect_token(TokenType.EndOfStream)
 
 		self._lexer = None
+		self._tokens.clear()
 
-		return scene
+	def _parse_scene(self, string, begin, end, offsets):
+		self._lexer = self._lexer_type(string, begin, end)
+		self._tokens.clear()
 
-	def _parse_scene(self):
-		scene = Create("Scene")
-		scene.extend(self._parse_body_elements(allow_template=True))
-		return scene
+		body = self._parse_body_elements(allow_template=True, offsets=offsets)
+
+		self._skip_newlines()
+		self._expect_token(TokenType.EndOfStream)
+
+		lines = self._lexer.lines
+
+		self._lexer = None
+		self._tokens.clear()
+
+		return body, lines
 
 	def _parse_create(self):
 		self._expect_token(TokenType.Identifier, "create")
@@ -344,21 +441,26 @@ class Parser:
 				return self._parse_body_elements(allow_template=allow_template)
 		return []
 
-	def _parse_body_elements(self, *, allow_template=False):
-		body = []
+	def _parse_body_elements(self, *, allow_template=False, offsets=None):
+		return list(self._iter_body_elements(allow_template=allow_template, offsets=offsets))
+
+	def _iter_body_elements(self, *, allow_template=False, offsets=None):
 		while True:
 			self._skip_newlines()
+			if offsets is not None:
+				offsets.append(self._peek().begin)
 			if self._peek_if(TokenType.Identifier, "create"):
-				body.append(self._parse_create())
+				yield self._parse_create()
 			elif self._peek_if(TokenType.Identifier, "template"):
 				if not allow_template:
 					self._fail("Template not allowed", token=self._peek())
-				body.append(self._parse_template())
+				yield self._parse_template()
 			elif self._peek_if(TokenType.Identifier):
-				body.append(self._parse_assignment())
+				yield self._parse_assignment()
 			else:
+				if offsets is not None:
+					offsets.pop()
 				break
-		return body
 
 	def _parse_assignment(self):
 		name = self._parse_lvalue()
@@ -464,5 +566,13 @@ class Parser:
 			self._unexpected()
 
 
-def parse(string):
-	return Parser().parse(string)
+def parse(string, *, lexer=Lexer):
+	return Parser(lexer=lexer).parse(string)
+
+
+def iter_parse(string, *, lexer=Lexer, offsets=None):
+	return Parser(lexer=lexer).iter_parse(string, offsets)
+
+
+def reparse(scene, begin, end, text, *, lexer=Lexer):
+	return Parser(lexer=lexer).reparse(scene, begin, end, text)
@@ -55,7 +55,7 @@ class Image:
 	def new(size, background=Color(0, 0, 0, 255)):
 		assert isinstance(size, Size) and size.area > 0
 		assert isinstance(background, (Vec4, Color))
-		image = _Image.new("RGBA", tuple(map(int, size)), tuple(map(int, background)))
+		image = _Image.new("RGBA", tuple(map(int, size)), background.rgba32)
 		return Image(image)
 
 	@staticmethod
@@ -144,7 +144,10 @@ class Image:
 		assert isinstance(fill, (Vec4, Color))
 		assert isinstance(outline, (Vec4, Color))
 
-		if fill.a == 0 and outline.a == 0:
+		fill, outline = fill.rgba32, outline.rgba32
+		fill_alpha, outline_alpha = fill >> 24, outline >> 24
+
+		if fill_alpha == 0 and outline_alpha == 0:
 			return
 
 		x, y, x2, y2 = map(int, chain(bounds.min, bounds.max))
@@ -153,22 +156,19 @@ class Image:
 		x2 -= 1
 		y2 -= 1
 
-		fill = tuple(map(int, fill))
-		outline = tuple(map(int, outline))
-
-		if fill[3] == 255:
+		if fill_alpha == 255:
 			draw = _ImageDraw.Draw(self._image, "RGBA")
 			draw.rectangle((x, y, x2, y2), fill=fill)
-		elif fill[3] > 0:
+		elif fill_alpha > 0:
 			image = _Image.new("RGBA", self._image.size, (0, 0, 0, 0))
 			draw = _ImageDraw.Draw(image, "RGBA")
 			draw.rectangle((x, y, x2, y2), fill=fill)
 			self._image = _Image.alpha_composite(self._image, image)
 
-		if outline[3] == 255:
+		if outline_alpha == 255:
 			draw = _ImageDraw.Draw(self._image, "RGBA")
 			draw.rectangle((x, y, x2, y2), outline=outline, width=int(outline_width))
-		elif outline[3] > 0:
+		elif outline_alpha > 0:
 			image = _Image.new("RGBA", self._image.size, (0, 0, 0, 0))
 			draw = _ImageDraw.Draw(image, "RGBA")
 			draw.rectangle((x, y, x2, y2), outline=outline, width=int(outline_width))
@@ -182,27 +182,27 @@ class Image:
 		assert isinstance(fill, (Vec4, Color))
 		assert isinstance(outline, (Vec4, Color))
 
-		if fill.a == 0 and outline.a == 0:
+		fill, outline = fill.rgba32, outline.rgba32
+		fill_alpha, outline_alpha = fill >> 24, outline >> 24
+
+		if fill_alpha == 0 and outline_alpha == 0:
 			return
 
 		x, y, x2, y2 = center.x - radius_x, center.y - radius_y, center.x + radius_x, center.y + radius_y
 
-		fill = tuple(map(int, fill))
-		outline = tuple(map(int, outline))
-
-		if fill[3] == 255:
+		if fill_alpha == 255:
 			draw = _ImageDraw.Draw(self._image, "RGBA")
 			draw.ellipse((x, y, x2, y2), fill=fill)
-		elif fill[3] > 0:
+		elif fill_alpha > 0:
 			image = _Image.new("RGBA", self._image.size, (0, 0, 0, 0))
 			draw = _ImageDraw.Draw(image, "RGBA")
 			draw.ellipse((x, y, x2, y2), fill=fill)
 			self._image = _Image.alpha_composite(self._image, image)
 
-		if outline[3] == 255:
+		if outline_alpha == 255:
 			draw = _ImageDraw.Draw(self._image, "RGBA")
 			draw.ellipse((x, y, x2, y2), outline=outline, width=int(outline_width))
-		elif outline[3] > 0:
+		elif outline_alpha > 0:
 			image = _Image.new("RGBA", self._image.size, (0, 0, 0, 0))
 			draw = _ImageDraw.Draw(image, "RGBA")
 			draw.ellipse((x, y, x2, y2), outline=outline, width=int(outline_width))
@@ -215,27 +215,27 @@ class Image:
 		assert isinstance(start_angle, (int, float))
 		assert isinstance(end_angle, (int, float))
 
-		if fill.a == 0 and outline.a == 0:
+		fill, outline = fill.rgba32, outline.rgba32
+		fill_alpha, outline_alpha = fill >> 24, outline >> 24
+
+		if fill_alpha == 0 and outline_alpha == 0:
 			return
 
 		x, y, x2, y2 = center.x - radius_x, center.y - radius_y, center.x + radius_x, center.y + radius_y
 
-		fill = tuple(map(int, fill))
-		outline = tuple(map(int, outline))
-
-		if fill[3] == 255:
+		if fill_alpha == 255:
 			draw = _ImageDraw.Draw(self._image, "RGBA")
 			draw.pieslice((x, y, x2, y2), start_angle, end_angle, fill=fill)
-		elif fill[3] > 0:
+		elif fill_alpha > 0:
 			image = _Image.new("RGBA", self._image.size, (0, 0, 0, 0))
 			draw = _ImageDraw.Draw(image, "RGBA")
 			draw.pieslice((x, y, x2, y2), start_angle, end_angle, fill=fill)
 			self._image = _Image.alpha_composite(self._image, image)
 
-		if outline[3] == 255:
+		if outline_alpha == 255:
 			draw = _ImageDraw.Draw(self._image, "RGBA")
 			draw.pieslice((x, y, x2, y2), start_angle, end_angle, outline=outline, width=int(outline_width))
-		elif outline[3] > 0:
+		elif outline_alpha > 0:
 			image = _Image.new("RGBA", self._image.size, (0, 0, 0, 0))
 			draw = _ImageDraw.Draw(image, "RGBA")
 			draw.pieslice((x, y, x2, y2), start_angle, end_angle, outline=outline, width=int(outline_width))
@@ -246,18 +246,21 @@ class Image:
 		assert isinstance(p2, (Vec2, Point))
 		assert isinstance(fill, (Vec4, Color))
 
-		if fill.a == 0:
+		fill = fill.rgba32
+		fill_alpha = fill >> 24
+
+		if fill_alpha == 0:
 			return
 
 		x, y, x2, y2 = p1.x, p1.y, p2.x, p2.y
 
-		if fill.a == 255:
+		if fill_alpha == 255:
 			draw = _ImageDraw.Draw(self._image, "RGBA")
-			draw.line((x, y, x2, y2), fill=tuple(map(int, fill)), width=int(width))
+			draw.line((x, y, x2, y2), fill=fill, width=int(width))
 		else:
 			image = _Image.new("RGBA", self._image.size, (0, 0, 0, 0))
 			draw = _ImageDraw.Draw(image, "RGBA")
-			draw.line((x, y, x2, y2), fill=tuple(map(int, fill)), width=int(width))
+			draw.line((x, y, x2, y2), fill=fill, width=int(width))
 			self._image = _Image.alpha_composite(self._image, image)
 
 	def draw_text(self, text, position, fill, font, anchor=Anchor.Center, alignment=Alignment.Left):
@@ -267,7 +270,10 @@ class Image:
 		assert isinstance(font, Font)
 		assert isinstance(alignment, Alignment)
 
-		if fill.a == 0:
+		fill = fill.rgba32
+		fill_alpha = fill >> 24
+
+		if fill_alpha == 0:
 			return
 
 		text_width, text_height = font.measure_text(text)
@@ -287,13 +293,13 @@ class Image:
 
 		position = x, y
 
-		if fill.a == 255:
+		if fill_alpha == 255:
 			draw = _ImageDraw.Draw(self._image, "RGBA")
-			draw.text(position, text, fill=tuple(map(int, fill)), font=font._font, align=alignment.value)
+			draw.text(position, text, fill=fill, font=font._font, align=alignment.value)
 		else:
 			image = _Image.new("RGBA", self._image.size, (0, 0, 0, 0))
 			draw = _ImageDraw.Draw(image, "RGBA")
-			draw.text(position, text, fill=tuple(map(int, fill)), font=font._font, align=alignment.value)
+			draw.text(position, text, fill=fill, font=font._font, align=alignment.value)
 			self._image = _Image.alpha_composite(self._image, image)
 
 
@@ -12,6 +12,7 @@ from .datatypes import Point, Size, Rect
 from .rasterizer import Image, Font
 from .rasterizer import Anchor, Alignment
 from .elements import Element, Scene
+from .timeline import Timeline
 from .utilities import iter_all_superclasses
 
 
@@ -148,7 +149,7 @@ def render(scene, time=0):
 
 
 # TODO: Consider removing "inclusive" and instead use "scene.p_inclusive"
-def render_animation(scene, *, inclusive=True):
+def render_animation(scene, *, inclusive=True, vectorize=False):
 	renderer = Renderer()
 
 	duration = scene.p_duration.seconds
@@ -156,6 +157,11 @@ def render_animation(scene, *, inclusive=True):
 
 	frame_count = calc_frame_count(duration, frame_rate, inclusive=inclusive)
 
+	# Evaluate the animated properties for all frames up front
+	timeline = None
+	if vectorize:
+		timeline = Timeline(scene, (time for frame, time in iter_frame_time(duration, frame_rate, inclusive=inclusive)))
+
 	add_newline = False
 
 	frames = []
@@ -168,7 +174,11 @@ def render_animation(scene, *, inclusive=True):
 		f = StringIO()
 		try:
 			with redirect_stdout(f):
-				frames.append(_render(renderer, scene, time))
+				if timeline is not None:
+					timeline.apply(frame)
+					frames.append(renderer.render(scene))
+				else:
+					frames.append(_render(renderer, scene, time))
 		finally:
 			output = f.getvalue()
 			if output:
@@ -2,12 +2,14 @@
 # -*- coding: utf-8 -*-
 
 from contextlib import contextmanager, suppress
+from functools import partial
 from operator import attrgetter
 
-from .parser import parse, _units, Node, Create, Template, Name
-from .datatypes import Value, Number, String, Angle, AngleUnit, Time, TimeUnit, BinOp, UnaryOp, Call
+from .parser import parse, _units, Node, Create, Template, Define, Assign, Name
+from .datatypes import Value, String, intern_number, Angle, AngleUnit, Time, TimeUnit, BinOp, UnaryOp, Call
 from .elements import Element, Scene, Percentage, ElementError, ElementPropertyDefinedError, CircularReferenceError
 from .functions import functions
+from .optimizer import fold_constants
 
 
 class SceneBuilderError(Exception):
@@ -15,9 +17,11 @@ class SceneBuilderError(Exception):
 
 
 class SceneBuilder:
-	def __init__(self):
+	def __init__(self, *, parse_cache=None):
+		self.parse_cache = parse_cache
 		self.templates = None
 		self._elements = None
+		self._recipes = None
 
 	@property
 	def _element(self):
@@ -50,13 +54,15 @@ class SceneBuilder:
 				raise self._create_error(f"Creating undefined {template!r} template", token=token) from None
 
 		if isinstance(template, Template):
+			operations = self._compile_template(template)
+
 			with self._push_element(element):
 				self._apply_template(element, template.inherit or "Drawable", token=token)
 
-				for child in self._build_children(template):
-					pass
+				for operation in operations:
+					operation()
 		else:
-			element.on_ready()
+			element.ready()
 
 	def _get_property(self, element, name, *, token=None):
 		assert isinstance(element, Element)
@@ -86,19 +92,31 @@ class SceneBuilder:
 
 	def build(self, string):
 		if isinstance(string, str):
+			if self.parse_cache is not None:
+				return self.build(self.parse_cache.parse(string))
 			return self.build(parse(string))
 		else:
 			assert isinstance(string, Create)
 			assert string.element == "Scene"
 
-			self.templates = dict((template.__name__, template) for template in Element.list_element_types())
-			self._elements = []
+			return self.build_stream(string.children)
+
+	def build_stream(self, nodes):
+		"""Build the scene from an iterable of top-level nodes, e.g. iter_parse().
+
+		Each node is built as soon as it is produced, such that
+		building overlaps with parsing.
+		"""
+
+		self.templates = dict((template.__name__, template) for template in Element.list_element_types())
+		self._elements = []
+		self._recipes = {}
 
-			scene = self._build(string)
+		scene = self._build_element(Create("Scene"), map(fold_constants, nodes))
 
-			assert isinstance(scene, Scene)
+		assert isinstance(scene, Scene)
 
-			return scene
+		return scene
 
 	def _build(self, node):
 		assert isinstance(node, Node)
@@ -111,6 +129,12 @@ class SceneBuilder:
 			yield self._build(child)
 
 	def _build_Create(self, create):
+		return self._build_element(create, create.children)
+
+	def _build_element(self, create, children):
+		return self._create_element(create, (partial(self._build, child) for child in children))
+
+	def _create_element(self, create, operations):
 		if create.name:
 			raise NotImplementedError
 
@@ -132,8 +156,8 @@ class SceneBuilder:
 		self._apply_template(element, create.element, token=create.token)
 
 		with self._push_element(element):
-			for child in self._build_children(create):
-				pass
+			for operation in operations:
+				operation()
 
 		try:
 			element.on_created()
@@ -159,15 +183,18 @@ class SceneBuilder:
 
 		value = self._build(define.value)
 
+		self._define(name, value, token=define.token)
+
+		return None
+
+	def _define(self, name, value, *, token=None):
 		assert isinstance(name, str)
 		assert isinstance(value, Value)
 
 		try:
 			self._element.define(name, value)
 		except ElementPropertyDefinedError as ex:
-			raise self._create_error(f"{ex} in {self._element.__class__.__name__}", token=define.token) from None
-
-		return None
+			raise self._create_error(f"{ex} in {self._element.__class__.__name__}", token=token) from None
 
 	def _build_Assign(self, assign):
 		assert len(assign.children) == 2
@@ -178,20 +205,23 @@ class SceneBuilder:
 
 		value = self._build(assign.value)
 
+		self._assign(name, value, token=assign.token)
+
+		return None
+
+	def _assign(self, name, value, *, token=None):
 		assert isinstance(name, str)
 		assert isinstance(value, Value)
 
 		try:
 			self._element.set(name, value)
 		except KeyError:
-			raise self._create_error(f"Assigning value to undefined property {name!r} in {self._element.__class__.__name__}", token=assign.token) from None
+			raise self._create_error(f"Assigning value to undefined property {name!r} in {self._element.__class__.__name__}", token=token) from None
 		except TypeError as ex:
-			raise self._create_error(f"{ex} in {self._element.__class__.__name__}", token=assign.token) from None
+			raise self._create_error(f"{ex} in {self._element.__class__.__name__}", token=token) from None
 		except CircularReferenceError as ex:
 			paths = "\n".join(" -> ".join(map(attrgetter("name"), path)) for path in ex.paths)
-			raise self._create_error(f"{ex} in {self._element.__class__.__name__}", after=f"Paths:\n{paths}", token=assign.token) from None
-
-		return None
+			raise self._create_error(f"{ex} in {self._element.__class__.__name__}", after=f"Paths:\n{paths}", token=token) from None
 
 	def _build_MemberAccess(self, member_access):
 		value = self._build(member_access.value)
@@ -220,7 +250,7 @@ class SceneBuilder:
 		value, unit = number.value, number.unit
 
 		if unit is None:
-			return Number(value)
+			return intern_number(value)
 		elif unit == "%":
 			return Percentage(value)
 		elif unit in (unit.value for unit in AngleUnit):
@@ -240,6 +270,137 @@ class SceneBuilder:
 		args = tuple(self._build_children(call))
 		return Call(functions[call.name], args)
 
+	def _build_Constant(self, constant):
+		assert len(constant.children) == 0
+		return constant.value
+
 	def _build_Name(self, name):
 		assert len(name.children) == 0
 		return self._get_property(self._element, name.name, token=name.token)
+
+	# Templates are compiled once into a recipe, i.e. a flat list of
+	# operations, which define, set and create everything the template
+	# body does when instantiated, without walking the template's tree
+
+	def _compile_template(self, template):
+		try:
+			return self._recipes[template]
+		except KeyError:
+			pass
+
+		recipe = self._compile_body(template.children, 0)
+		self._recipes[template] = recipe
+
+		return recipe
+
+	def _compile_body(self, nodes, depth):
+		return [self._compile_operation(node, depth) for node in nodes]
+
+	def _compile_operation(self, node, depth):
+		if isinstance(node, Create):
+			return partial(self._create_element, node, self._compile_body(node.children, depth + 1))
+
+		if isinstance(node, (Define, Assign)):
+			assert len(node.children) == 2
+
+			name = node.name
+			assert isinstance(name, Name)
+			name = name.name
+
+			value = self._compile_value(node.value, depth)
+			apply = self._define if isinstance(node, Define) else self._assign
+			token = node.token
+
+			def operation():
+				apply(name, value(), token=token)
+
+			return operation
+
+		return partial(self._build, node)
+
+	def _compile_value(self, node, depth):
+		compile = getattr(self, "_compile_%s" % node.__class__.__name__, None)
+		if compile is None:
+			return partial(self._build, node)
+		return compile(node, depth)
+
+	def _compile_Constant(self, constant, depth):
+		value = constant.value
+		return lambda: value
+
+	def _compile_UnaryOp(self, unary_op, depth):
+		assert len(unary_op.children) == 1
+		op = unary_op.op
+		operand = self._compile_value(unary_op.operand, depth)
+		return lambda: UnaryOp(op, operand())
+
+	def _compile_BinOp(self, bin_op, depth):
+		assert len(bin_op.children) == 2
+		op = bin_op.op
+		lhs = self._compile_value(bin_op.lhs, depth)
+		rhs = self._compile_value(bin_op.rhs, depth)
+		return lambda: BinOp(op, lhs(), rhs())
+
+	def _compile_Call(self, call, depth):
+		name = call.name
+		args = [self._compile_value(arg, depth) for arg in call.args]
+
+		def build():
+			values = tuple(arg() for arg in args)
+			return Call(functions[name], values)
+
+		return build
+
+	def _compile_MemberAccess(self, member_access, depth):
+		value = self._compile_value(member_access.value, depth)
+		member = member_access.member
+		token = member_access.token
+
+		assert isinstance(member, Name)
+
+		def build():
+			element = value().eval()
+			assert isinstance(element, Element)
+			return self._get_property(element, member.name, token=token)
+
+		return build
+
+	def _compile_Name(self, name, depth):
+		assert len(name.children) == 0
+
+		token = name.token
+		name = name.name
+
+		# The elements created by the template itself always have the same
+		# properties. So once a name has been resolved, it is known whether
+		# it is found in one of those, or whether the lookup needs to
+		# continue at the template's root element (which might receive
+		# additional properties from its parent, e.g. ix from HBox)
+		hops = None
+
+		def build():
+			nonlocal hops
+
+			element = self._element
+
+			if hops is not None:
+				for _ in range(min(hops, depth)):
+					element = element.parent
+				if hops < depth:
+					return element.get(name)
+				skipped = depth
+			else:
+				skipped = 0
+
+			while element is not None:
+				properties = element.properties
+				if name in properties:
+					if hops is None:
+						hops = skipped
+					return element.get(name)
+				element = element.parent
+				skipped += 1
+
+			self._fail(f"Undefined property {name!r}", token=token)
+
+		return build
@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+try:
+	import numpy as np
+except ImportError:
+	np = None
+
+from .datatypes import intern_number, NumberType, Vec4, Vec4Type
+from .elements import Scene, AnimationDirection, AnimationFillMode
+
+
+def _box_number(value):
+	return intern_number(value)
+
+
+def _box_vec4(value):
+	return Vec4(*value)
+
+
+def _boxed(value):
+	return value
+
+
+# Value types which can be interpolated as arrays, and how to turn
+# a value into an array row and an array row back into a value
+_array_types = {
+	NumberType: (lambda value: value.value, _box_number),
+	Vec4Type: (lambda value: value.xyzw, _box_vec4),
+}
+
+
+def _ping_pong(value, lower, upper):
+	length = upper - lower
+	length2 = length * 2
+	ping_ponged = np.abs(np.mod(value, length2))
+	return np.where(ping_ponged >= length, lower + length2 - ping_ponged, lower + ping_ponged)
+
+
+def _is_integral(row):
+	return all(type(component) is int for component in (row if isinstance(row, tuple) else (row,)))
+
+
+def _is_vectorizable(animation):
+	# A zero length iteration fails in Animation.sample(),
+	# let that report the error
+	return animation.schedule.iteration_duration != 0
+
+
+def _sample_keyframes(animation, times):
+	"""Computes what Animation.sample() does for all times at once.
+
+	Returns whether the animation is affecting each time, along with the
+	indices of the keyframes before and after, and the interpolation
+	factor between them.
+	"""
+	schedule = animation.schedule
+	direction = schedule.direction
+	iteration_duration = schedule.iteration_duration
+
+	lower, upper = schedule.window
+	affecting = (lower <= times) & (times <= upper)
+
+	time = np.maximum(times - schedule.delay, 0)
+
+	if schedule.infinite_iterations:
+		is_after = np.zeros(len(times), dtype=bool)
+	else:
+		is_after = time >= schedule.duration
+		time = np.minimum(time, schedule.duration)
+
+	if direction in (AnimationDirection.Normal, AnimationDirection.Reverse):
+		time = np.mod(time, iteration_duration)
+		if direction == AnimationDirection.Reverse:
+			time = iteration_duration - time
+	elif direction == AnimationDirection.Alternate:
+		time = _ping_pong(time, 0, iteration_duration)
+	elif direction == AnimationDirection.AlternateReverse:
+		time = _ping_pong(time + iteration_duration, 0, iteration_duration)
+
+	keyframe_times = np.array(schedule.keyframe_times, dtype=float)
+	last = len(keyframe_times) - 1
+
+	# Index of the first keyframe after time, like Animation.get_between()
+	index = np.searchsorted(keyframe_times, time, side="right")
+	before = np.where(index == 0, 0, np.where(index > last, last, index - 1))
+	after = np.where(index == 0, 0, np.where(index > last, last, index))
+
+	if schedule.integer_iterations and schedule.fill_mode in (AnimationFillMode.After, AnimationFillMode.Always):
+		if direction == AnimationDirection.Normal:
+			before = np.where(is_after, last, before)
+			after = np.where(is_after, last, after)
+		elif direction == AnimationDirection.Reverse:
+			before = np.where(is_after, 0, before)
+			after = np.where(is_after, 0, after)
+
+	same = before == after
+	lower, upper = keyframe_times[before], keyframe_times[after]
+	t = (time - lower) / np.where(same, 1, upper - lower)
+
+	return affecting, before, after, same, t
+
+
+class Timeline:
+	"""The values of every animated property of a scene, evaluated for
+	all given times at once.
+
+	Number and Vec4 properties are interpolated as NumPy arrays over
+	all frames, when NumPy is available. Other properties, or all of
+	them without NumPy, are sampled frame by frame as Scene.compute()
+	does. apply() then assigns the values of a frame to the scene,
+	which is the same as calling Scene.compute() with its time.
+	"""
+
+	def __init__(self, scene, times, *, vectorize=True):
+		assert isinstance(scene, Scene)
+
+		self.scene = scene
+		self.times = tuple(times)
+		self.vectorize = vectorize and np is not None
+
+		self._tracks = []
+
+		for animations, assignments in scene.frame_program():
+			tracks = None
+			if self.vectorize and all(map(_is_vectorizable, animations)):
+				tracks = self._vectorized_tracks(animations, assignments)
+			if tracks is None:
+				tracks = self._sampled_tracks(animations, assignments)
+			self._tracks.extend(tracks)
+
+	def __len__(self):
+		return len(self.times)
+
+	def apply(self, frame):
+		for set, box, values in self._tracks:
+			set(box(values[frame]))
+		self.scene.invalidate_samples()
+
+	def _sampled_tracks(self, animations, assignments):
+		values = [[] for _ in assignments]
+
+		for time in self.times:
+			samples = {}
+			animate = samples.__setitem__
+			for animation in animations:
+				animation.sample(time, animate)
+			for (name, _, value), track in zip(assignments, values):
+				track.append(samples.get(name, value))
+
+		return [(set, _boxed, track) for (_, set, _), track in zip(assignments, values)]
+
+	def _vectorized_tracks(self, animations, assignments):
+		for _, _, value in assignments:
+			if value.type not in _array_types:
+				return None
+
+		times = np.array(self.times, dtype=float)
+		keyframes = [(animation, _sample_keyframes(animation, times)) for animation in animations]
+
+		tracks = []
+
+		for name, set, value in assignments:
+			to_array, box = _array_types[value.type]
+
+			values = np.broadcast_to(np.array(to_array(value), dtype=float), (len(times),) + np.shape(to_array(value)))
+
+			# Which value each frame was copied from, or -1 if interpolated,
+			# such that copied integers can be turned back into integers
+			integral = [_is_integral(to_array(value))]
+			source = np.zeros(len(times), dtype=int)
+
+			for animation, (affecting, before, after, same, t) in keyframes:
+				if name not in animation.element_properties:
+					continue
+
+				rows = [to_array(keyframe.eval(name)) for keyframe in animation.keyframes]
+				keyframe_values = np.array(rows, dtype=float)
+
+				source = np.where(affecting, np.where(same, len(integral) + before, -1), source)
+				integral.extend(map(_is_integral, rows))
+
+				if keyframe_values.ndim > 1:
+					affecting, same, t = affecting[:, None], same[:, None], t[:, None]
+
+				a, b = keyframe_values[before], keyframe_values[after]
+				sampled = np.where(same, a, (1 - t) * a + t * b)
+
+				values = np.where(affecting, sampled, values)
+
+			is_integral = np.array(integral + [False])[source]
+
+			if is_integral.any():
+				track = [integer if copied else row for row, integer, copied in zip(values.tolist(), values.astype(int).tolist(), is_integral.tolist())]
+			else:
+				track = values.tolist()
+
+			tracks.append((set, box, track))
+
+		return tracks
@@ -1,7 +1,9 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+from contextlib import contextmanager
 from functools import reduce
+import gc
 
 
 _sentinel = object()
@@ -35,3 +37,16 @@ def iter_all_subclasses(cls):
 	for cls in cls.__subclasses__():
 		yield cls
 		yield from iter_all_subclasses(cls)
+
+
+@contextmanager
+def gc_paused():
+	# Building many long-lived objects at once makes the cyclic
+	# garbage collector repeatedly (and needlessly) traverse them
+	enabled = gc.isenabled()
+	gc.disable()
+	try:
+		yield
+	finally:
+		if enabled:
+			gc.enable()